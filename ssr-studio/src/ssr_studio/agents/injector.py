@@ -60,7 +60,12 @@ INJECTION STRATEGY: {injection_strategy}
 {strategy_instructions}
 
 ARTIFACT REQUIREMENTS:
-1. test_script.sh - Bash script that runs tests and outputs to stdout
+1. test_script.sh - Bash script that runs tests and outputs to stdout.
+   Optionally, when $SSR_TEST_FILTER is set (newline-separated test names
+   as reported by the parser), it may run only those tests; it must run
+   the full suite when the variable is unset. Filtered results are checked
+   against the oracle's failing test names, and the full suite is run when
+   any of those names is missing from them.
 2. test_files.txt - List of test file paths (one per line)
 3. test_parser.py - Python script that reads stdin and outputs JSON mapping:
    {{"test_name": "passed"|"failed", ...}}
@@ -250,8 +255,8 @@ class InjectorAgent:
             
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
             
-            # Record tool call
-            self._tool_calls.append(ToolCallRecord(
+            # Record tool call (fields are produced here, skip validation)
+            self._tool_calls.append(ToolCallRecord.model_construct(
                 timestamp=start_time,
                 tool_name=tool_call.name,
                 arguments=tool_call.arguments,
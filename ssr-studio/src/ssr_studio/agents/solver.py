@@ -243,7 +243,7 @@ class SolverAgent:
         # Build attempt record
         duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
         
-        return SolverAttempt(
+        return SolverAttempt.model_construct(
             artifact_id=self.artifact.metadata.artifact_id,
             attempt_number=self.attempt_number,
             oracle_test_patch=self._get_oracle_test_patch(),
@@ -281,8 +281,8 @@ class SolverAgent:
             
             duration_ms = int((datetime.utcnow() - start_time).total_seconds() * 1000)
             
-            # Record tool call
-            self._tool_calls.append(ToolCallRecord(
+            # Record tool call (fields are produced here, skip validation)
+            self._tool_calls.append(ToolCallRecord.model_construct(
                 timestamp=start_time,
                 tool_name=tool_call.name,
                 arguments=tool_call.arguments,
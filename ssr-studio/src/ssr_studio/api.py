@@ -2,6 +2,7 @@
 FastAPI application and API routes for SSR Studio.
 """
 
+import asyncio
 from contextlib import asynccontextmanager
 from typing import Any
 from uuid import UUID
@@ -9,6 +10,7 @@ from uuid import UUID
 from fastapi import FastAPI, HTTPException, Depends, Query, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
 from sqlalchemy.orm import selectinload
@@ -28,6 +30,7 @@ from ssr_studio.models import (
     Environment,
     EnvironmentCreate,
     Episode,
+    EpisodeConfig,
     EpisodeCreate,
     EpisodeSummary,
     EpisodeStatus,
@@ -39,6 +42,10 @@ from ssr_studio.models import (
 )
 from ssr_studio.storage import get_storage
 from ssr_studio.orchestrator import EpisodeOrchestrator
+from ssr_studio.sandbox import sandbox_pool
+
+# Built once and reused for every stored episode config read back from the DB
+_episode_config_adapter = TypeAdapter(EpisodeConfig)
 
 
 @asynccontextmanager
@@ -48,6 +55,7 @@ async def lifespan(app: FastAPI):
     await init_db()
     yield
     # Shutdown
+    await sandbox_pool.cleanup()
 
 
 app = FastAPI(
@@ -154,7 +162,9 @@ async def delete_environment(
 ):
     """Delete an environment."""
     result = await db.execute(
-        select(EnvironmentDB).where(EnvironmentDB.env_id == env_id)
+        select(EnvironmentDB)
+        .options(selectinload(EnvironmentDB.episodes))
+        .where(EnvironmentDB.env_id == env_id)
     )
     env = result.scalar_one_or_none()
     if not env:
@@ -317,14 +327,21 @@ async def get_episode_artifact(
     
     storage = get_storage()
     artifact = episode.artifact
+    test_script, test_files, test_parser, bug_inject_diff, test_weaken_diff = await asyncio.gather(
+        storage.read(artifact.test_script_ref),
+        storage.read(artifact.test_files_ref),
+        storage.read(artifact.test_parser_ref),
+        storage.read(artifact.bug_inject_diff_ref),
+        storage.read(artifact.test_weaken_diff_ref),
+    )
     
     return {
         "artifact_id": str(artifact.artifact_id),
-        "test_script": await storage.read(artifact.test_script_ref),
-        "test_files": (await storage.read(artifact.test_files_ref)).split("\n"),
-        "test_parser": await storage.read(artifact.test_parser_ref),
-        "bug_inject_diff": await storage.read(artifact.bug_inject_diff_ref),
-        "test_weaken_diff": await storage.read(artifact.test_weaken_diff_ref),
+        "test_script": test_script,
+        "test_files": test_files.split("\n"),
+        "test_parser": test_parser,
+        "bug_inject_diff": bug_inject_diff,
+        "test_weaken_diff": test_weaken_diff,
         "metadata": {
             "injection_strategy": artifact.injection_strategy,
             "bug_order": artifact.bug_order,
@@ -351,7 +368,10 @@ async def download_artifact_bundle(
         raise HTTPException(status_code=404, detail="No artifact for this episode")
     
     storage = get_storage()
-    tarball = await storage.get_artifact_tarball(episode.artifact.artifact_id)
+    try:
+        tarball = await storage.get_artifact_tarball(episode.artifact.artifact_id)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Artifact files not found")
     
     return StreamingResponse(
         tarball,
@@ -405,12 +425,16 @@ async def get_solver_attempts(
     attempts = result.scalars().all()
     
     storage = get_storage()
+    
+    async def read_patch(ref: str | None) -> str | None:
+        return await storage.read(ref) if ref else None
+    
+    pred_patches = await asyncio.gather(
+        *(read_patch(attempt.pred_patch_ref) for attempt in attempts)
+    )
+    
     response = []
-    for attempt in attempts:
-        pred_patch = None
-        if attempt.pred_patch_ref:
-            pred_patch = await storage.read(attempt.pred_patch_ref)
-        
+    for attempt, pred_patch in zip(attempts, pred_patches):
         response.append(SolverAttempt(
             attempt_id=attempt.attempt_id,
             artifact_id=attempt.artifact_id,
@@ -491,9 +515,7 @@ async def get_metrics(
 
 async def _build_episode_response(episode_db: EpisodeDB, db: AsyncSession) -> Episode:
     """Build a full Episode response from database model."""
-    from ssr_studio.models import EpisodeConfig
-    
-    config = EpisodeConfig(**episode_db.config) if episode_db.config else EpisodeConfig()
+    config = _episode_config_adapter.validate_python(episode_db.config or {})
     
     return Episode(
         episode_id=episode_db.episode_id,
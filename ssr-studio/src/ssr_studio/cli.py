@@ -130,11 +130,14 @@ def env_remove(
     """Remove an environment."""
     from ssr_studio.database import async_session_factory, EnvironmentDB
     from sqlalchemy import select
+    from sqlalchemy.orm import selectinload
     
     async def _remove():
         async with async_session_factory() as db:
             result = await db.execute(
-                select(EnvironmentDB).where(EnvironmentDB.env_id == UUID(env_id))
+                select(EnvironmentDB)
+                .options(selectinload(EnvironmentDB.episodes))
+                .where(EnvironmentDB.env_id == UUID(env_id))
             )
             env = result.scalar_one_or_none()
             
@@ -165,6 +168,7 @@ def run(
     from ssr_studio.database import async_session_factory, EpisodeDB, EnvironmentDB
     from ssr_studio.models import EpisodeConfig, EpisodeStatus, InjectionStrategy
     from ssr_studio.orchestrator import EpisodeOrchestrator
+    from ssr_studio.sandbox import sandbox_pool
     from sqlalchemy import select
     
     async def _run():
@@ -205,7 +209,10 @@ def run(
                     task = progress.add_task("Running episode...", total=None)
                     
                     orchestrator = EpisodeOrchestrator(db)
-                    await orchestrator.run_episode(episode.episode_id)
+                    try:
+                        await orchestrator.run_episode(episode.episode_id)
+                    finally:
+                        await sandbox_pool.cleanup()
                     
                     await db.refresh(episode)
                     
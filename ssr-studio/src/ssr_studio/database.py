@@ -8,8 +8,17 @@ from datetime import datetime
 from typing import Any
 from uuid import UUID, uuid4
 
-from sqlalchemy import JSON, Boolean, DateTime, Enum, Float, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy import (
+    Boolean,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, UUID as PGUUID
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
@@ -30,6 +39,12 @@ engine = create_async_engine(
     settings.database_url,
     pool_size=settings.database_pool_size,
     max_overflow=settings.database_max_overflow,
+    pool_recycle=settings.database_pool_recycle,
+    connect_args={
+        "prepared_statement_cache_size": settings.database_statement_cache_size,
+        "statement_cache_size": settings.database_statement_cache_size,
+    },
+    insertmanyvalues_page_size=settings.database_insertmanyvalues_page_size,
     echo=settings.debug,
 )
 
@@ -72,7 +87,10 @@ class EnvironmentDB(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    episodes: Mapped[list["EpisodeDB"]] = relationship(back_populates="environment")
+    episodes: Mapped[list["EpisodeDB"]] = relationship(
+        back_populates="environment",
+        lazy="raise_on_sql",
+    )
 
 
 class ArtifactDB(Base):
@@ -109,7 +127,7 @@ class ArtifactDB(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    episode: Mapped["EpisodeDB"] = relationship(back_populates="artifact")
+    episode: Mapped["EpisodeDB"] = relationship(back_populates="artifact", lazy="raise_on_sql")
 
 
 class ValidationReportDB(Base):
@@ -121,14 +139,17 @@ class ValidationReportDB(Base):
     artifact_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), nullable=False)
     
     valid: Mapped[bool] = mapped_column(Boolean, nullable=False)
-    steps: Mapped[dict] = mapped_column(JSON, nullable=False)  # List of validation step results
+    steps: Mapped[dict] = mapped_column(JSONB, nullable=False)  # List of validation step results
     total_duration_ms: Mapped[int] = mapped_column(Integer, default=0)
     logs_ref: Mapped[str | None] = mapped_column(String(512), nullable=True)
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationship
-    episode: Mapped["EpisodeDB"] = relationship(back_populates="validation_report")
+    episode: Mapped["EpisodeDB"] = relationship(
+        back_populates="validation_report",
+        lazy="raise_on_sql",
+    )
 
 
 class SolverAttemptDB(Base):
@@ -143,7 +164,7 @@ class SolverAttemptDB(Base):
     
     # Results
     success: Mapped[bool] = mapped_column(Boolean, default=False)
-    test_summary: Mapped[dict] = mapped_column(JSON, default=dict)
+    test_summary: Mapped[dict] = mapped_column(JSONB, default=dict)
     
     # Execution details
     total_tool_steps: Mapped[int] = mapped_column(Integer, default=0)
@@ -158,7 +179,10 @@ class SolverAttemptDB(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     
     # Relationships
-    episode: Mapped["EpisodeDB"] = relationship(back_populates="solver_attempts")
+    episode: Mapped["EpisodeDB"] = relationship(
+        back_populates="solver_attempts",
+        lazy="raise_on_sql",
+    )
 
 
 class EpisodeDB(Base):
@@ -174,7 +198,7 @@ class EpisodeDB(Base):
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     
     # Configuration
-    config: Mapped[dict] = mapped_column(JSON, nullable=False)
+    config: Mapped[dict] = mapped_column(JSONB, nullable=False)
     
     # Artifact reference
     artifact_id: Mapped[UUID | None] = mapped_column(
@@ -201,11 +225,23 @@ class EpisodeDB(Base):
     started_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     
-    # Relationships
-    environment: Mapped["EnvironmentDB"] = relationship(back_populates="episodes")
-    artifact: Mapped["ArtifactDB | None"] = relationship(back_populates="episode")
-    validation_report: Mapped["ValidationReportDB | None"] = relationship(back_populates="episode")
-    solver_attempts: Mapped[list["SolverAttemptDB"]] = relationship(back_populates="episode")
+    # Relationships (lazy="raise_on_sql": read paths opt in with selectinload)
+    environment: Mapped["EnvironmentDB"] = relationship(
+        back_populates="episodes",
+        lazy="raise_on_sql",
+    )
+    artifact: Mapped["ArtifactDB | None"] = relationship(
+        back_populates="episode",
+        lazy="raise_on_sql",
+    )
+    validation_report: Mapped["ValidationReportDB | None"] = relationship(
+        back_populates="episode",
+        lazy="raise_on_sql",
+    )
+    solver_attempts: Mapped[list["SolverAttemptDB"]] = relationship(
+        back_populates="episode",
+        lazy="raise_on_sql",
+    )
 
 
 class TrainingRunDB(Base):
@@ -215,7 +251,7 @@ class TrainingRunDB(Base):
     
     run_id: Mapped[UUID] = mapped_column(PGUUID(as_uuid=True), primary_key=True, default=uuid4)
     base_model: Mapped[str] = mapped_column(String(256), nullable=False)
-    lora_config: Mapped[dict] = mapped_column(JSON, nullable=False)
+    lora_config: Mapped[dict] = mapped_column(JSONB, nullable=False)
     
     # Progress
     current_step: Mapped[int] = mapped_column(Integer, default=0)
@@ -223,10 +259,10 @@ class TrainingRunDB(Base):
     status: Mapped[str] = mapped_column(String(32), default="pending")
     
     # Metrics over time (stored as JSON arrays)
-    metrics_history: Mapped[dict] = mapped_column(JSON, default=dict)
+    metrics_history: Mapped[dict] = mapped_column(JSONB, default=dict)
     
     # Checkpoints
-    checkpoint_refs: Mapped[list] = mapped_column(JSON, default=list)
+    checkpoint_refs: Mapped[list] = mapped_column(JSONB, default=list)
     
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     updated_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
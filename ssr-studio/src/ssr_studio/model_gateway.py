@@ -9,12 +9,13 @@ Provides a unified interface to different LLM providers:
 Handles tool calling, rate limiting, and token counting.
 """
 
+import functools
 import json
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
-from typing import Any, AsyncIterator, Callable
+from typing import Any, AsyncIterator, Callable, Sequence
 
 import httpx
 import tiktoken
@@ -33,7 +34,7 @@ class Role(str, Enum):
     TOOL = "tool"
 
 
-@dataclass
+@dataclass(slots=True)
 class Message:
     """A chat message."""
     role: Role
@@ -43,15 +44,20 @@ class Message:
     tool_call_id: str | None = None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True, eq=False)
 class ToolDefinition:
-    """Definition of a tool the model can call."""
+    """
+    Definition of a tool the model can call.
+    
+    Frozen and hashed by identity, so provider-specific specs can be
+    built once per tool set and reused on every turn.
+    """
     name: str
     description: str
     parameters: dict[str, Any]  # JSON Schema
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolCall:
     """A tool call from the model."""
     id: str
@@ -59,7 +65,7 @@ class ToolCall:
     arguments: dict[str, Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class GenerationResult:
     """Result of a model generation."""
     content: str | None = None
@@ -70,6 +76,37 @@ class GenerationResult:
     total_tokens: int = 0
 
 
+# Tool sets are module-level constants, so their provider specs are built
+# once and shared by every request; callers must not mutate the results
+@functools.cache
+def _openai_tool_specs(tools: tuple[ToolDefinition, ...]) -> list[dict]:
+    """Build OpenAI function specs for a tool set."""
+    return [
+        {
+            "type": "function",
+            "function": {
+                "name": tool.name,
+                "description": tool.description,
+                "parameters": tool.parameters,
+            },
+        }
+        for tool in tools
+    ]
+
+
+@functools.cache
+def _anthropic_tool_specs(tools: tuple[ToolDefinition, ...]) -> list[dict]:
+    """Build Anthropic tool specs for a tool set."""
+    return [
+        {
+            "name": tool.name,
+            "description": tool.description,
+            "input_schema": tool.parameters,
+        }
+        for tool in tools
+    ]
+
+
 class ModelProvider(ABC):
     """Abstract base class for model providers."""
     
@@ -77,7 +114,7 @@ class ModelProvider(ABC):
     async def generate(
         self,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         stop: list[str] | None = None,
@@ -89,7 +126,7 @@ class ModelProvider(ABC):
     async def generate_stream(
         self,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         stop: list[str] | None = None,
@@ -124,36 +161,25 @@ class OpenAIProvider(ModelProvider):
     
     def _convert_messages(self, messages: list[Message]) -> list[dict]:
         """Convert messages to OpenAI format."""
-        result = []
-        for msg in messages:
-            d = {"role": msg.role.value, "content": msg.content}
-            if msg.name:
-                d["name"] = msg.name
-            if msg.tool_calls:
-                d["tool_calls"] = msg.tool_calls
-            if msg.tool_call_id:
-                d["tool_call_id"] = msg.tool_call_id
-            result.append(d)
-        return result
-    
-    def _convert_tools(self, tools: list[ToolDefinition]) -> list[dict]:
-        """Convert tools to OpenAI format."""
         return [
             {
-                "type": "function",
-                "function": {
-                    "name": tool.name,
-                    "description": tool.description,
-                    "parameters": tool.parameters,
-                },
+                "role": m.role.value,
+                "content": m.content,
+                **({"name": m.name} if m.name else {}),
+                **({"tool_calls": m.tool_calls} if m.tool_calls else {}),
+                **({"tool_call_id": m.tool_call_id} if m.tool_call_id else {}),
             }
-            for tool in tools
+            for m in messages
         ]
     
+    def _convert_tools(self, tools: Sequence[ToolDefinition]) -> list[dict]:
+        """Convert tools to OpenAI format."""
+        return _openai_tool_specs(tuple(tools))
+    
     async def generate(
         self,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         stop: list[str] | None = None,
@@ -197,7 +223,7 @@ class OpenAIProvider(ModelProvider):
     async def generate_stream(
         self,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         stop: list[str] | None = None,
@@ -267,21 +293,14 @@ class AnthropicProvider(ModelProvider):
         
         return system, result
     
-    def _convert_tools(self, tools: list[ToolDefinition]) -> list[dict]:
+    def _convert_tools(self, tools: Sequence[ToolDefinition]) -> list[dict]:
         """Convert tools to Anthropic format."""
-        return [
-            {
-                "name": tool.name,
-                "description": tool.description,
-                "input_schema": tool.parameters,
-            }
-            for tool in tools
-        ]
+        return _anthropic_tool_specs(tuple(tools))
     
     async def generate(
         self,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         stop: list[str] | None = None,
@@ -330,7 +349,7 @@ class AnthropicProvider(ModelProvider):
     async def generate_stream(
         self,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         stop: list[str] | None = None,
@@ -376,18 +395,19 @@ class LocalProvider(ModelProvider):
     
     def _convert_messages(self, messages: list[Message]) -> list[dict]:
         """Convert messages to OpenAI-compatible format."""
-        result = []
-        for msg in messages:
-            d = {"role": msg.role.value, "content": msg.content}
-            if msg.name:
-                d["name"] = msg.name
-            result.append(d)
-        return result
+        return [
+            {
+                "role": m.role.value,
+                "content": m.content,
+                **({"name": m.name} if m.name else {}),
+            }
+            for m in messages
+        ]
     
     async def generate(
         self,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         stop: list[str] | None = None,
@@ -421,7 +441,7 @@ class LocalProvider(ModelProvider):
     async def generate_stream(
         self,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float = 0.7,
         max_tokens: int = 4096,
         stop: list[str] | None = None,
@@ -489,7 +509,7 @@ class ModelGateway:
         self,
         role: str,  # "injector" or "solver"
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float | None = None,
         max_tokens: int | None = None,
     ) -> GenerationResult:
@@ -540,7 +560,7 @@ class ModelGateway:
         self,
         role: str,
         messages: list[Message],
-        tools: list[ToolDefinition] | None = None,
+        tools: Sequence[ToolDefinition] | None = None,
         temperature: float | None = None,
         max_tokens: int | None = None,
     ) -> AsyncIterator[str]:
@@ -7,10 +7,12 @@ validation reports, and solver attempts as described in the PRD.
 
 from datetime import datetime
 from enum import Enum
+from functools import cached_property
 from typing import Any
 from uuid import UUID, uuid4
 
 from pydantic import BaseModel, Field
+from typing_extensions import TypedDict  # pydantic requires it on Python < 3.12
 
 
 # =============================================================================
@@ -131,6 +133,11 @@ class BugArtifact(BaseModel):
     # Optional: for higher-order bugs
     parent_artifact_id: UUID | None = None
     bug_order: int = 1
+    
+    @cached_property
+    def test_files_text(self) -> str:
+        """Contents of test_files.txt (one path per line)."""
+        return "\n".join(self.test_files)
 
 
 # =============================================================================
@@ -174,6 +181,14 @@ class ToolCall(BaseModel):
     truncated: bool = False
 
 
+class TestSummary(TypedDict, total=False):
+    """Aggregate test counts for a solver attempt."""
+    passed: int
+    failed: int
+    skipped: int
+    error: int
+
+
 class SolverAttempt(BaseModel):
     """
     Single solver attempt and its evaluation (SSR paper §2.4).
@@ -190,7 +205,7 @@ class SolverAttempt(BaseModel):
     success: bool = False
     
     # Test results
-    test_summary: dict[str, int] = Field(
+    test_summary: TestSummary = Field(
         default_factory=lambda: {"passed": 0, "failed": 0, "skipped": 0, "error": 0}
     )
     per_test_status: dict[str, TestStatus] = Field(default_factory=dict)
@@ -7,13 +7,18 @@ INJECT → VALIDATE → SOLVE(N) → EVALUATE → COMPLETE
 Implements the episode execution sequence from PRD §8.2.
 """
 
-import json
+import asyncio
+import time
+from collections import deque
+from contextlib import AsyncExitStack
 from datetime import datetime
 from typing import Any
 from uuid import UUID
 
+import orjson
 import structlog
-from sqlalchemy import select
+from pydantic import TypeAdapter
+from sqlalchemy import insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -34,14 +39,21 @@ from ssr_studio.models import (
     SolverAttempt,
     EvaluationReport,
     TestStatus,
+    ToolCall,
 )
-from ssr_studio.sandbox import Sandbox
+from ssr_studio.sandbox import Sandbox, sandbox_pool
 from ssr_studio.storage import get_storage
 from ssr_studio.validator import Validator
 from ssr_studio.agents import InjectorAgent, SolverAgent
 
 logger = structlog.get_logger()
 
+# Parser output -> evaluation status; anything else counts as an error
+_EVAL_STATUS_MAP = {"passed": TestStatus.PASSED, "failed": TestStatus.FAILED}
+
+# Serializes tool traces straight from the models, without per-call dicts
+_tool_calls_adapter = TypeAdapter(list[ToolCall])
+
 
 class EpisodeOrchestrator:
     """
@@ -70,7 +82,9 @@ class EpisodeOrchestrator:
         logger.info("Starting episode", episode_id=str(episode_id))
         
         try:
-            # Load episode
+            # Load episode. Only the environment is read by the pipeline;
+            # artifact/validation_report are written by FK column and their
+            # raise_on_sql relationships guard against hidden lazy loads.
             result = await self.db.execute(
                 select(EpisodeDB)
                 .options(selectinload(EpisodeDB.environment))
@@ -86,12 +100,12 @@ class EpisodeOrchestrator:
                 logger.info("Episode cancelled", episode_id=str(episode_id))
                 return
             
-            # Mark as started
+            # Mark as started (committed with the INJECTING status)
             episode.started_at = datetime.utcnow()
-            await self.db.commit()
             
-            # Get configuration
-            config = EpisodeConfig(**episode.config) if episode.config else EpisodeConfig()
+            # Get configuration (written by our own API/CLI from a validated
+            # EpisodeConfig, so skip re-validation)
+            config = EpisodeConfig.model_construct(**(episode.config or {}))
             
             # Get environment
             env = episode.environment
@@ -105,12 +119,19 @@ class EpisodeOrchestrator:
         except Exception as e:
             logger.exception("Episode failed", episode_id=str(episode_id), error=str(e))
             try:
-                result = await self.db.execute(
-                    select(EpisodeDB).where(EpisodeDB.episode_id == episode_id)
+                # Discard the failed transaction and mark the episode failed
+                # with a single UPDATE (no need to reload the row)
+                await self.db.rollback()
+                await self.db.execute(
+                    update(EpisodeDB)
+                    .where(EpisodeDB.episode_id == episode_id)
+                    .values(
+                        status=EpisodeStatus.FAILED.value,
+                        error_message=str(e),
+                        completed_at=datetime.utcnow(),
+                    )
                 )
-                episode = result.scalar_one_or_none()
-                if episode:
-                    await self._fail_episode(episode, str(e))
+                await self.db.commit()
             except Exception:
                 pass
     
@@ -122,13 +143,16 @@ class EpisodeOrchestrator:
     ) -> None:
         """Run the full episode pipeline."""
         
-        # Phase 1: Injection
+        # Phase 1: Injection. Commit before the injector runs so the row
+        # lock and DB connection are not held for the whole agent run.
         episode.status = EpisodeStatus.INJECTING.value
         await self.db.commit()
         
         logger.info("Phase 1: Injection", episode_id=str(episode.episode_id))
         
-        async with Sandbox(image_ref=env.docker_image_ref) as sandbox:
+        # Pooled sandboxes are reset to a pristine workspace on reuse, so
+        # a batch of episodes on one env pays container startup only once.
+        async with sandbox_pool.lease(env.docker_image_ref) as sandbox:
             # Store container digest
             episode.container_image_digest = await sandbox.get_image_digest()
             
@@ -156,16 +180,15 @@ class EpisodeOrchestrator:
             # Store artifact
             artifact_db = await self._store_artifact(artifact)
             episode.artifact_id = artifact_db.artifact_id
-            await self.db.commit()
             
-            # Phase 2: Validation
+            # Phase 2: Validation (commits the stored artifact)
             episode.status = EpisodeStatus.VALIDATING.value
             await self.db.commit()
             
             logger.info("Phase 2: Validation", episode_id=str(episode.episode_id))
             
             # Reset sandbox to original state
-            await sandbox.bash("git checkout ssr-original -- .")
+            await sandbox.git_reset_to_tag("ssr-original")
             
             validator = Validator(sandbox)
             validation_report = await validator.validate(artifact)
@@ -173,7 +196,6 @@ class EpisodeOrchestrator:
             # Store validation report
             report_db = await self._store_validation_report(validation_report)
             episode.validation_report_id = report_db.report_id
-            await self.db.commit()
             
             if not validation_report.valid:
                 # Artifact invalid - compute negative reward and complete
@@ -189,74 +211,101 @@ class EpisodeOrchestrator:
                 )
                 return
             
-            # Phase 3: Solving
+            # Phase 3: Solving (commits the validation report)
             episode.status = EpisodeStatus.SOLVING.value
             await self.db.commit()
             
             logger.info("Phase 3: Solving", episode_id=str(episode.episode_id))
             
-            solver_attempts = []
-            successful_attempts = 0
-            
-            for attempt_num in range(1, config.solver_attempts + 1):
-                logger.info(
-                    "Solver attempt",
-                    episode_id=str(episode.episode_id),
-                    attempt=attempt_num,
-                    total=config.solver_attempts,
-                )
+            # Attempts are independent: spread them over the current sandbox
+            # and extra ones leased from the pool for the same image. Extra
+            # leases never wait for pool capacity while this episode holds a
+            # sandbox, so with a busy pool some attempts share a sandbox.
+            async with AsyncExitStack() as stack:
+                solver_sandboxes = [
+                    sandbox,
+                    *await self._lease_solver_sandboxes(
+                        stack, env.docker_image_ref, config.solver_attempts - 1
+                    ),
+                ]
                 
-                # Prepare buggy sandbox for solver
-                await self._prepare_buggy_sandbox(sandbox, artifact)
+                pending = deque(range(1, config.solver_attempts + 1))
+                attempts_by_num: dict[int, SolverAttempt] = {}
+                active = len(solver_sandboxes)
                 
-                # Run solver agent
-                solver = SolverAgent(
-                    sandbox=sandbox,
-                    artifact=artifact,
-                    attempt_number=attempt_num,
-                )
+                async def drain(solver_sandbox: Sandbox) -> None:
+                    nonlocal active
+                    used = False
+                    try:
+                        while pending:
+                            attempt_num = pending.popleft()
+                            if used:
+                                # Back to the pristine, tagged original state
+                                solver_sandbox = await self._reset_solver_sandbox(
+                                    stack, env.docker_image_ref, solver_sandbox
+                                )
+                            if solver_sandbox is None:
+                                if active > 1:
+                                    # Leave the attempt to a sandbox still in use
+                                    pending.appendleft(attempt_num)
+                                    return
+                                # No sandbox left: the remaining attempts fail
+                                for num in (attempt_num, *pending):
+                                    attempts_by_num[num] = SolverAttempt(
+                                        artifact_id=artifact.artifact_id,
+                                        attempt_number=num,
+                                        oracle_test_patch="",
+                                    )
+                                pending.clear()
+                                return
+                            used = True
+                            attempts_by_num[attempt_num] = await self._run_single_attempt(
+                                episode.episode_id,
+                                attempt_num,
+                                config.solver_attempts,
+                                solver_sandbox,
+                                artifact,
+                            )
+                    finally:
+                        active -= 1
                 
-                attempt = await solver.run()
-                
-                # Phase 4: Evaluate this attempt
-                if attempt.pred_patch:
-                    evaluation = await self._evaluate_attempt(
-                        sandbox, artifact, attempt
-                    )
-                    attempt.success = evaluation.success
-                    attempt.test_summary = {
-                        "passed": evaluation.tests_passed,
-                        "failed": evaluation.tests_failed,
-                    }
-                    
-                    if evaluation.success:
-                        successful_attempts += 1
-                
-                # Store attempt
-                attempt_db = await self._store_solver_attempt(episode.episode_id, attempt)
-                solver_attempts.append(attempt)
-                
-                # Reset sandbox for next attempt
-                await sandbox.bash("git checkout ssr-original -- .")
+                # A TaskGroup cancels and awaits the other attempts if one
+                # fails, so no attempt outlives the leases of its sandbox
+                try:
+                    async with asyncio.TaskGroup() as tg:
+                        for solver_sandbox in solver_sandboxes:
+                            tg.create_task(drain(solver_sandbox))
+                except ExceptionGroup as eg:
+                    # Surface the first failure as the episode error
+                    raise eg.exceptions[0]
+                solver_attempts = [attempts_by_num[n] for n in sorted(attempts_by_num)]
+            
+            successful_attempts = sum(1 for a in solver_attempts if a.success)
+            
+            # Store attempt files, then insert all rows in one executemany
+            attempt_rows = await asyncio.gather(*(
+                self._store_solver_attempt(episode.episode_id, attempt)
+                for attempt in solver_attempts
+            ))
+            
+            await self.db.execute(insert(SolverAttemptDB), list(attempt_rows))
             
             # Phase 5: Compute metrics and rewards
             episode.status = EpisodeStatus.EVALUATING.value
-            await self.db.commit()
+            await self.db.flush()
             
-            solve_rate = successful_attempts / config.solver_attempts
+            total_attempts = config.solver_attempts
+            solve_rate = successful_attempts / total_attempts
             episode.solve_rate = solve_rate
             
             # Compute injector reward (SSR paper Eq. (1))
-            alpha = config.reward_alpha
-            if solve_rate == 0 or solve_rate == 1:
-                r_inject = -alpha
-            else:
-                r_inject = 1 - (1 + alpha) * solve_rate
+            r_inject = RewardCalculator.compute_from_counts(
+                config.reward_alpha, successful_attempts, total_attempts
+            )
             episode.r_inject = r_inject
             
-            # Compute average solver reward (SSR paper Eq. (2))
-            r_solve_values = [1.0 if a.success else -1.0 for a in solver_attempts]
-            episode.r_solve_avg = sum(r_solve_values) / len(r_solve_values)
+            # Average solver reward (SSR paper Eq. (2)): s*(+1) + (n-s)*(-1) over n
+            episode.r_solve_avg = (2 * successful_attempts - total_attempts) / total_attempts
             
             # Mark complete
             episode.status = EpisodeStatus.COMPLETE.value
@@ -271,6 +320,91 @@ class EpisodeOrchestrator:
                 r_solve_avg=episode.r_solve_avg,
             )
     
+    async def _tag_solver_sandbox(self, sandbox: Sandbox) -> None:
+        """Tag the original state of an additional solver sandbox."""
+        await sandbox.git_init()
+        await sandbox.git_tag("ssr-original")
+    
+    async def _lease_solver_sandboxes(
+        self, stack: AsyncExitStack, image_ref: str, count: int
+    ) -> list[Sandbox]:
+        """
+        Lease and tag up to ``count`` extra solver sandboxes.
+        
+        Best effort: leases that fail (e.g. the pool is full) are skipped and
+        their attempts run in the other sandboxes.
+        """
+        async def lease() -> Sandbox:
+            extra = await stack.enter_async_context(sandbox_pool.lease(image_ref, wait=False))
+            await self._tag_solver_sandbox(extra)
+            return extra
+        
+        results = await asyncio.gather(
+            *(lease() for _ in range(count)), return_exceptions=True
+        )
+        extras = [r for r in results if isinstance(r, Sandbox)]
+        if len(extras) < count:
+            logger.info(
+                "Running solver attempts with fewer sandboxes", leased=len(extras), wanted=count
+            )
+        return extras
+    
+    async def _reset_solver_sandbox(
+        self, stack: AsyncExitStack, image_ref: str, sandbox: Sandbox
+    ) -> Sandbox | None:
+        """
+        Reset a sandbox used by a previous attempt for the next one.
+        
+        If it cannot be restored (e.g. the agent made the workspace
+        read-only), a fresh sandbox is leased instead. Returns None when
+        neither works.
+        """
+        if await sandbox.restore_workspace():
+            await self._tag_solver_sandbox(sandbox)
+            return sandbox
+        logger.warning("Cannot reset solver sandbox", sandbox_id=str(sandbox.sandbox_id))
+        replacements = await self._lease_solver_sandboxes(stack, image_ref, 1)
+        return replacements[0] if replacements else None
+    
+    async def _run_single_attempt(
+        self,
+        episode_id: UUID,
+        attempt_num: int,
+        total_attempts: int,
+        sandbox: Sandbox,
+        artifact: BugArtifact,
+    ) -> SolverAttempt:
+        """Run one solver attempt (prepare → solve → evaluate) in a sandbox."""
+        logger.info(
+            "Solver attempt",
+            episode_id=str(episode_id),
+            attempt=attempt_num,
+            total=total_attempts,
+        )
+        
+        # Prepare buggy sandbox for solver
+        await self._prepare_buggy_sandbox(sandbox, artifact)
+        
+        # Run solver agent
+        solver = SolverAgent(
+            sandbox=sandbox,
+            artifact=artifact,
+            attempt_number=attempt_num,
+        )
+        
+        attempt = await solver.run()
+        
+        # Phase 4: Evaluate this attempt
+        if attempt.pred_patch:
+            evaluation = await self._evaluate_attempt(sandbox, artifact, attempt)
+            attempt.success = evaluation.success
+            attempt.test_summary = {
+                "passed": evaluation.tests_passed,
+                "failed": evaluation.tests_failed,
+            }
+        
+        return attempt
+    
     async def _prepare_buggy_sandbox(
         self,
         sandbox: Sandbox,
@@ -283,21 +417,23 @@ class EpisodeOrchestrator:
         then removes .git to prevent history leakage (SSR paper §2.4).
         """
         # Reset to original
-        await sandbox.bash("git checkout ssr-original -- .")
+        await sandbox.git_reset_to_tag("ssr-original")
         
-        # Apply bug injection
-        await sandbox.write_file("bug_inject.diff", artifact.bug_inject_diff)
-        await sandbox.bash("patch -p1 < bug_inject.diff")
+        # Write patches, test script and parser for solver
+        await sandbox.write_files({
+            "bug_inject.diff": artifact.bug_inject_diff,
+            "test_weaken.diff": artifact.test_weaken_diff,
+            "test_script.sh": artifact.test_script,
+            "test_parser.py": artifact.test_parser,
+            "test_files.txt": artifact.test_files_text,
+        })
         
-        # Apply test weakening
-        await sandbox.write_file("test_weaken.diff", artifact.test_weaken_diff)
-        await sandbox.bash("patch -p1 < test_weaken.diff")
-        
-        # Write test script and parser for solver
-        await sandbox.write_file("test_script.sh", artifact.test_script)
-        await sandbox.write_file("test_parser.py", artifact.test_parser)
-        await sandbox.write_file("test_files.txt", "\n".join(artifact.test_files))
-        await sandbox.bash("chmod +x test_script.sh")
+        # Apply bug injection and test weakening in a single exec
+        await sandbox.bash(
+            "patch -p1 < bug_inject.diff; "
+            "patch -p1 < test_weaken.diff; "
+            "chmod +x test_script.sh"
+        )
         
         # Remove .git and reinitialize (leak prevention)
         await sandbox.git_init()
@@ -320,26 +456,25 @@ class EpisodeOrchestrator:
         """
         logger.info("Evaluating attempt", attempt_id=str(attempt.attempt_id))
         
-        start_time = datetime.utcnow()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Start from buggy state
-            await sandbox.bash("git checkout ssr-buggy -- .")
+            await sandbox.git_reset_to_tag("ssr-buggy")
             
             # Apply predicted patch
             if attempt.pred_patch:
                 await sandbox.write_file("pred_patch.diff", attempt.pred_patch)
                 result = await sandbox.bash("patch -p1 < pred_patch.diff")
                 if result.exit_code != 0:
-                    return EvaluationReport(
+                    return EvaluationReport.model_construct(
                         attempt_id=attempt.attempt_id,
                         success=False,
-                        duration_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000),
+                        duration_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
                     )
             
             # Restore test files from original (prevents "fixing by editing tests")
-            for test_file in artifact.test_files:
-                await sandbox.bash(f"git checkout ssr-original -- {test_file}")
+            await sandbox.git_restore_from_tag("ssr-original", artifact.test_files)
             
             # Run tests
             test_result = await sandbox.bash(
@@ -349,40 +484,46 @@ class EpisodeOrchestrator:
             
             # Parse results
             try:
-                test_mapping = json.loads(test_result.stdout.strip())
+                test_mapping = orjson.loads(test_result.stdout)
                 
-                passed = sum(1 for s in test_mapping.values() if s == "passed")
-                failed = sum(1 for s in test_mapping.values() if s != "passed")
+                # Single pass: convert statuses via the precomputed map
+                per_test_status = {}
+                passed = 0
+                status_map, ts_passed, ts_error = (
+                    _EVAL_STATUS_MAP, TestStatus.PASSED, TestStatus.ERROR
+                )
+                for k, v in test_mapping.items():
+                    status = per_test_status[k] = status_map.get(v, ts_error)
+                    if status is ts_passed:
+                        passed += 1
+                failed = len(test_mapping) - passed
                 
                 success = failed == 0
                 
-                return EvaluationReport(
+                return EvaluationReport.model_construct(
                     attempt_id=attempt.attempt_id,
                     success=success,
                     tests_passed=passed,
                     tests_failed=failed,
                     tests_total=len(test_mapping),
-                    per_test_status={
-                        k: TestStatus(v) if v in ["passed", "failed"] else TestStatus.ERROR
-                        for k, v in test_mapping.items()
-                    },
+                    per_test_status=per_test_status,
                     test_files_restored=artifact.test_files,
-                    duration_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000),
+                    duration_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
                 )
                 
-            except json.JSONDecodeError:
-                return EvaluationReport(
+            except orjson.JSONDecodeError:
+                return EvaluationReport.model_construct(
                     attempt_id=attempt.attempt_id,
                     success=False,
-                    duration_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000),
+                    duration_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
                 )
         
         except Exception as e:
             logger.error("Evaluation failed", error=str(e))
-            return EvaluationReport(
+            return EvaluationReport.model_construct(
                 attempt_id=attempt.attempt_id,
                 success=False,
-                duration_ms=int((datetime.utcnow() - start_time).total_seconds() * 1000),
+                duration_ms=(time.perf_counter_ns() - start_ns) // 1_000_000,
             )
     
     async def _store_artifact(self, artifact: BugArtifact) -> ArtifactDB:
@@ -417,8 +558,7 @@ class EpisodeOrchestrator:
         )
         
         self.db.add(artifact_db)
-        await self.db.commit()
-        await self.db.refresh(artifact_db)
+        await self.db.flush()
         
         return artifact_db
     
@@ -443,8 +583,7 @@ class EpisodeOrchestrator:
         )
         
         self.db.add(report_db)
-        await self.db.commit()
-        await self.db.refresh(report_db)
+        await self.db.flush()
         
         return report_db
     
@@ -452,50 +591,44 @@ class EpisodeOrchestrator:
         self,
         episode_id: UUID,
         attempt: SolverAttempt,
-    ) -> SolverAttemptDB:
-        """Store solver attempt."""
-        # Store predicted patch if present
-        pred_patch_ref = None
+    ) -> dict[str, Any]:
+        """
+        Store solver attempt files and build its database row.
+        
+        Returns the column values for SolverAttemptDB; the caller inserts
+        all attempts of an episode in a single bulk INSERT.
+        """
+        # Store tool trace and predicted patch (if present) concurrently
+        writes = [
+            self.storage.write(
+                f"attempts/{attempt.attempt_id}/tool_trace.json",
+                _tool_calls_adapter.dump_json(
+                    attempt.tool_calls, exclude={"__all__": {"truncated"}}
+                ),
+            ),
+        ]
         if attempt.pred_patch:
-            pred_patch_ref = await self.storage.write(
+            writes.append(self.storage.write(
                 f"attempts/{attempt.attempt_id}/pred_patch.diff",
                 attempt.pred_patch,
-            )
+            ))
         
-        # Store tool trace
-        tool_trace_ref = await self.storage.write(
-            f"attempts/{attempt.attempt_id}/tool_trace.json",
-            json.dumps([
-                {
-                    "timestamp": tc.timestamp.isoformat(),
-                    "tool_name": tc.tool_name,
-                    "arguments": tc.arguments,
-                    "result": tc.result,
-                    "duration_ms": tc.duration_ms,
-                }
-                for tc in attempt.tool_calls
-            ]),
-        )
-        
-        attempt_db = SolverAttemptDB(
-            attempt_id=attempt.attempt_id,
-            episode_id=episode_id,
-            artifact_id=attempt.artifact_id,
-            attempt_number=attempt.attempt_number,
-            success=attempt.success,
-            test_summary=attempt.test_summary,
-            total_tool_steps=attempt.total_tool_steps,
-            total_tokens_used=attempt.total_tokens_used,
-            duration_ms=attempt.duration_ms,
-            pred_patch_ref=pred_patch_ref,
-            tool_trace_ref=tool_trace_ref,
-        )
+        tool_trace_ref, *rest = await asyncio.gather(*writes)
+        pred_patch_ref = rest[0] if rest else None
         
-        self.db.add(attempt_db)
-        await self.db.commit()
-        await self.db.refresh(attempt_db)
-        
-        return attempt_db
+        return {
+            "attempt_id": attempt.attempt_id,
+            "episode_id": episode_id,
+            "artifact_id": attempt.artifact_id,
+            "attempt_number": attempt.attempt_number,
+            "success": attempt.success,
+            "test_summary": attempt.test_summary,
+            "total_tool_steps": attempt.total_tool_steps,
+            "total_tokens_used": attempt.total_tokens_used,
+            "duration_ms": attempt.duration_ms,
+            "pred_patch_ref": pred_patch_ref,
+            "tool_trace_ref": tool_trace_ref,
+        }
     
     async def _fail_episode(self, episode: EpisodeDB, error_message: str) -> None:
         """Mark episode as failed."""
@@ -546,6 +679,26 @@ class RewardCalculator:
         
         return 1.0 - (1.0 + self.alpha) * solve_rate
     
+    @staticmethod
+    def compute_from_counts(alpha: float, successes: int, total: int) -> float:
+        """
+        Compute the injector reward for a valid artifact from attempt counts.
+        
+        Comparing integer counts avoids float equality on the solve rate.
+        
+        Args:
+            alpha: Penalty for bugs that are always or never solved
+            successes: Number of successful solver attempts
+            total: Total number of solver attempts
+        
+        Returns:
+            Reward value
+        """
+        if successes == 0 or successes == total:
+            return -alpha
+        
+        return 1.0 - (1.0 + alpha) * successes / total
+    
     def compute_solver_reward(self, success: bool) -> float:
         """
         Compute solver reward.
@@ -10,25 +10,222 @@ Implements the security requirements from the PRD:
 """
 
 import asyncio
+import codecs
+import io
 import json
-import os
-import shutil
+import posixpath
+import re
+import shlex
+import tarfile
 import tempfile
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
-from datetime import datetime
-from pathlib import Path
-from typing import Any
+from datetime import datetime, timezone
+from typing import IO, Any, AsyncIterator, Awaitable, ClassVar, TypeVar
 from uuid import UUID, uuid4
 
-import docker
-from docker.errors import ContainerError, ImageNotFound, APIError
-from docker.models.containers import Container
+import aiodocker
+from aiodocker.containers import DockerContainer
+from aiodocker.exceptions import DockerError
 
 from ssr_studio.config import settings
 import structlog
 
 logger = structlog.get_logger()
 
+T = TypeVar("T")
+
+# Output cap per stream for command output and file reads (50KB)
+_MAX_STREAM_CHARS = 50000
+
+# Max paths passed to one git invocation (keeps argv well under ARG_MAX)
+_GIT_PATHS_PER_CALL = 100
+
+# Git tag names accepted by the git_* helpers (safe to use unquoted in shell)
+_GIT_TAG_RE = re.compile(r"[A-Za-z0-9][A-Za-z0-9._/-]*")
+
+# Scratch directory cleared when a sandbox is recycled; changes here (and in
+# the workspace) do not stop a container from being reused
+_SCRATCH_DIR = "/tmp"
+
+# Edit operations applied in-container by _EDIT_SCRIPT
+_BATCHED_EDIT_TYPES = frozenset({"replace", "insert", "delete", "search_replace"})
+
+# Applies a batch of edit operations in one process: each file is read once,
+# edited in memory and written back once. Reads the JSON operation list from
+# stdin and prints one JSON result per operation. Files are read and written
+# with newline="" so CRLF line endings survive an edit.
+_EDIT_SCRIPT = r"""
+import json, os, sys
+
+ops = json.load(sys.stdin)
+files, owners, results = {}, {}, []
+
+def load(path):
+    if path not in files:
+        with open(path, newline="") as f:
+            files[path] = f.read()
+    return files[path]
+
+def split_lines(text):
+    # Only "\n" ends a line (as for grep -n and sed); str.splitlines would
+    # also split on form feeds, \x1c-\x1e, \x85, \u2028, ...
+    lines = [line + "\n" for line in text.split("\n")]
+    lines[-1] = lines[-1][:-1]
+    return lines if lines[-1] else lines[:-1]
+
+for i, op in enumerate(ops):
+    path, kind, args = op["file_path"], op["type"], op["args"]
+    try:
+        changed = 0
+        if kind == "replace":
+            files[path] = args["content"]
+        elif kind == "search_replace":
+            if not args["old_text"]:
+                raise ValueError("old_text must not be empty")
+            # One scan both finds and counts occurrences (reported as lines_changed)
+            parts = load(path).split(args["old_text"])
+            changed = len(parts) - 1
+            files[path] = args["new_text"].join(parts)
+        elif kind == "insert":
+            line = args["line"]
+            lines = split_lines(load(path))
+            if not 1 <= line <= len(lines) + 1:
+                raise ValueError(f"line {line} out of range (1-{len(lines) + 1})")
+            if line > len(lines) and lines and not lines[-1].endswith("\n"):
+                # Appending: end the old last line first rather than merging
+                lines[-1] += "\n"
+            lines.insert(line - 1, args["text"] + "\n")
+            files[path] = "".join(lines)
+        elif kind == "delete":
+            start = args["start_line"]
+            end = args.get("end_line", start)
+            lines = split_lines(load(path))
+            if not 1 <= start <= len(lines):
+                raise ValueError(f"start_line {start} out of range (1-{len(lines)})")
+            if end < start:
+                raise ValueError(f"end_line {end} is before start_line {start}")
+            before = len(lines)
+            del lines[start - 1:end]
+            files[path] = "".join(lines)
+            changed = before - len(lines)
+        owners.setdefault(path, []).append(i)
+        results.append({"success": True, "lines_changed": changed})
+    except Exception as e:
+        results.append({"success": False, "error": str(e), "lines_changed": 0})
+
+for path, indices in owners.items():
+    try:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", newline="") as f:
+            f.write(files[path])
+    except Exception as e:
+        for i in indices:
+            results[i] = {"success": False, "error": str(e), "lines_changed": 0}
+
+print(json.dumps(results))
+"""
+
+# Docker-style memory suffixes (as accepted by `docker run --memory`)
+_MEMORY_UNITS = {"b": 1, "k": 1024, "m": 1024 ** 2, "g": 1024 ** 3}
+
+
+class _CappedDecoder:
+    """Incrementally decodes a UTF-8 stream, keeping text only up to a size cap."""
+    
+    def __init__(self, limit: int):
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._pieces: list[str] = []
+        self._size = 0
+        self._limit = limit
+    
+    def feed(self, data: bytes) -> None:
+        """Decode a chunk, or drop it once the cap has been exceeded."""
+        if self._size <= self._limit:
+            # Slice the raw bytes first: a UTF-8 char is at most 4 bytes, so
+            # this still yields past the cap but never decodes much beyond it
+            # (the incremental decoder carries split characters over)
+            text = self._decoder.decode(data[:(self._limit + 1 - self._size) * 4])
+            self._pieces.append(text)
+            self._size += len(text)
+    
+    def text(self) -> str:
+        """Return the decoded text (longer than the cap if output was cut off)."""
+        if self._size <= self._limit:
+            self._pieces.append(self._decoder.decode(b"", final=True))
+        return "".join(self._pieces)
+
+
+class DockerDaemonTimeout(RuntimeError):
+    """Raised when a Docker control-plane call does not return in time."""
+
+
+async def _api_call(
+    awaitable: Awaitable[T],
+    operation: str,
+    timeout: int | None = None,
+) -> T:
+    """
+    Await a Docker control-plane call under the API timeout.
+    
+    Command execution (bash) has its own, longer per-command timeout.
+    """
+    timeout = timeout or settings.sandbox_docker_api_timeout
+    try:
+        return await asyncio.wait_for(awaitable, timeout=timeout)
+    except asyncio.TimeoutError:
+        raise DockerDaemonTimeout(f"Docker daemon did not complete {operation} within {timeout}s")
+
+
+async def _container_changes(client: aiodocker.Docker, container_id: str) -> list[dict] | None:
+    """
+    Get a container's filesystem changes (GET /containers/{id}/changes).
+    
+    aiodocker has no wrapper for this endpoint, so it is requested on the
+    client's own session, the same way aiodocker builds its API URLs.
+    """
+    url = f"{client.docker_host}/{client.api_version}/containers/{container_id}/changes"
+    async with client.session.get(url) as response:
+        if response.status >= 400:
+            raise DockerError(response.status, {"message": await response.text()})
+        return await response.json()
+
+
+def _spool_archive(archive: tarfile.TarFile) -> IO[bytes]:
+    """Copy a tar archive into an anonymous temp file on the host."""
+    spool = tempfile.TemporaryFile()
+    try:
+        with archive, tarfile.open(fileobj=spool, mode="w", format=tarfile.PAX_FORMAT) as out:
+            for member in archive:
+                out.addfile(member, archive.extractfile(member) if member.isfile() else None)
+    except BaseException:
+        spool.close()
+        raise
+    return spool
+
+
+def _read_spool(spool: IO[bytes]) -> bytes:
+    """Read back the whole content of a spooled archive."""
+    spool.seek(0)
+    return spool.read()
+
+
+def _checked_tag(tag_name: str) -> str:
+    """Validate a git tag name before it is interpolated into a shell command."""
+    if not _GIT_TAG_RE.fullmatch(tag_name):
+        raise ValueError(f"Invalid git tag name: {tag_name!r}")
+    return tag_name
+
+
+def _parse_memory_limit(limit: str) -> int:
+    """Convert a memory limit such as "4g" to bytes for the Engine API."""
+    limit = limit.strip().lower()
+    if limit and limit[-1] in _MEMORY_UNITS:
+        return int(float(limit[:-1]) * _MEMORY_UNITS[limit[-1]])
+    return int(limit)
+
 
 @dataclass
 class BashResult:
@@ -55,7 +252,7 @@ class EditResult:
     success: bool
     file_path: str
     error: str | None = None
-    lines_changed: int = 0
+    lines_changed: int = 0  # Occurrences replaced, for search_replace
 
 
 class Sandbox:
@@ -69,6 +266,20 @@ class Sandbox:
     - Non-root execution
     """
     
+    # Container settings shared by every sandbox (Docker Engine API format)
+    _BASE_CONTAINER_CONFIG: ClassVar[dict[str, Any]] = {
+        "Tty": True,
+        "OpenStdin": True,
+        "Cmd": ["/bin/bash"],
+    }
+    _BASE_HOST_CONFIG: ClassVar[dict[str, Any]] = {
+        "CpuPeriod": 100000,
+        # Security
+        "SecurityOpt": ["no-new-privileges:true"],
+        "CapDrop": ["ALL"],
+        "CapAdd": ["CHOWN", "SETUID", "SETGID", "DAC_OVERRIDE", "FOWNER"],
+    }
+    
     def __init__(
         self,
         image_ref: str,
@@ -77,6 +288,7 @@ class Sandbox:
         network_enabled: bool | None = None,
         cpu_limit: float | None = None,
         memory_limit: str | None = None,
+        docker_client: aiodocker.Docker | None = None,
     ):
         self.image_ref = image_ref
         self.sandbox_id = sandbox_id or uuid4()
@@ -85,9 +297,13 @@ class Sandbox:
         self.cpu_limit = cpu_limit or settings.sandbox_cpu_limit
         self.memory_limit = memory_limit or settings.sandbox_memory_limit
         
-        self._client: docker.DockerClient | None = None
-        self._container: Container | None = None
-        self._temp_dir: Path | None = None
+        # A client passed in (e.g. by SandboxPool) is shared and not closed here
+        self._shared_client = docker_client
+        self._client: aiodocker.Docker | None = None
+        self._container: DockerContainer | None = None
+        self._file_owner_ids: tuple[int, int] | None = None
+        self._image_digest: str | None = None
+        self._workspace_snapshot: IO[bytes] | None = None
         self._started = False
     
     @property
@@ -102,51 +318,49 @@ class Sandbox:
         
         logger.info("Starting sandbox", sandbox_id=str(self.sandbox_id), image=self.image_ref)
         
-        # Initialize Docker client
-        self._client = docker.from_env()
+        # Use the shared Docker client if given (native asyncio, no thread pool hops)
+        self._client = self._shared_client or aiodocker.Docker(url=settings.docker_host)
         
-        # Create temp directory for file transfers
-        self._temp_dir = Path(tempfile.mkdtemp(prefix=f"ssr-{self.sandbox_id}-"))
+        # Prepare container configuration (Docker Engine API format)
+        host_config = {
+            **self._BASE_HOST_CONFIG,
+            # Resource limits
+            "CpuQuota": int(self.cpu_limit * self._BASE_HOST_CONFIG["CpuPeriod"]),
+            "Memory": _parse_memory_limit(self.memory_limit),
+            # Network isolation
+            **({} if self.network_enabled else {"NetworkMode": "none"}),
+        }
         
-        # Prepare container configuration
         container_config = {
-            "image": self.image_ref,
-            "name": self.container_name,
-            "detach": True,
-            "tty": True,
-            "stdin_open": True,
-            "working_dir": self.work_dir,
-            "command": "/bin/bash",
-            # Resource limits
-            "cpu_period": 100000,
-            "cpu_quota": int(self.cpu_limit * 100000),
-            "mem_limit": self.memory_limit,
-            # Security
-            "security_opt": ["no-new-privileges:true"],
-            "cap_drop": ["ALL"],
-            "cap_add": ["CHOWN", "SETUID", "SETGID", "DAC_OVERRIDE", "FOWNER"],
+            **self._BASE_CONTAINER_CONFIG,
+            "Image": self.image_ref,
+            "WorkingDir": self.work_dir,
+            "HostConfig": host_config,
             # Labels for identification
-            "labels": {
+            "Labels": {
                 "ssr.sandbox_id": str(self.sandbox_id),
-                "ssr.created_at": datetime.utcnow().isoformat(),
+                "ssr.created_at": datetime.now(timezone.utc).isoformat(),
             },
         }
         
-        # Network isolation
-        if not self.network_enabled:
-            container_config["network_mode"] = "none"
-        
         # Create and start container
         try:
-            self._container = await asyncio.to_thread(
-                self._client.containers.run,
-                **container_config,
+            self._container = await _api_call(
+                self._client.containers.run(config=container_config, name=self.container_name),
+                "container run",
             )
             self._started = True
             logger.info("Sandbox started", container_id=self._container.id[:12])
-        except ImageNotFound:
-            raise RuntimeError(f"Docker image not found: {self.image_ref}")
-        except APIError as e:
+        except DockerDaemonTimeout:
+            # The daemon may have created the container anyway; remove it
+            # so a retry does not leave it running unowned
+            await self._remove_unowned_container()
+            await self._release_client()
+            raise
+        except DockerError as e:
+            await self._release_client()
+            if e.status == 404:
+                raise RuntimeError(f"Docker image not found: {self.image_ref}")
             raise RuntimeError(f"Failed to start sandbox: {e}")
     
     async def stop(self) -> None:
@@ -158,17 +372,38 @@ class Sandbox:
         
         try:
             if self._container:
-                await asyncio.to_thread(self._container.stop, timeout=10)
-                await asyncio.to_thread(self._container.remove, force=True)
+                await _api_call(self._container.stop(t=10), "container stop")
+                await _api_call(self._container.delete(force=True), "container delete")
         except Exception as e:
             logger.warning("Error stopping container", error=str(e))
         
-        # Clean up temp directory
-        if self._temp_dir and self._temp_dir.exists():
-            shutil.rmtree(self._temp_dir, ignore_errors=True)
+        await self._release_client()
         
+        if self._workspace_snapshot is not None:
+            self._workspace_snapshot.close()
+            self._workspace_snapshot = None
         self._started = False
         self._container = None
+        self._image_digest = None
+    
+    async def _remove_unowned_container(self) -> None:
+        """Force-remove this sandbox's container by name, if it exists."""
+        try:
+            await _api_call(
+                self._client.containers.container(self.container_name).delete(force=True),
+                "container delete",
+            )
+        except DockerError as e:
+            if e.status != 404:
+                logger.warning("Cannot remove container", name=self.container_name, error=str(e))
+        except DockerDaemonTimeout as e:
+            logger.warning("Cannot remove container", name=self.container_name, error=str(e))
+    
+    async def _release_client(self) -> None:
+        """Drop the Docker client, closing it only if this sandbox created it."""
+        if self._client and self._client is not self._shared_client:
+            await self._client.close()
+        self._client = None
     
     async def bash(
         self,
@@ -176,6 +411,7 @@ class Sandbox:
         timeout: int | None = None,
         cwd: str | None = None,
         env: dict[str, str] | None = None,
+        stderr_limit: int | None = None,
     ) -> BashResult:
         """
         Execute a bash command in the sandbox.
@@ -185,6 +421,7 @@ class Sandbox:
             timeout: Command timeout in seconds (default from settings)
             cwd: Working directory for the command
             env: Additional environment variables
+            stderr_limit: Characters of stderr to keep (default: the output cap)
         
         Returns:
             BashResult with exit code, stdout, stderr, and timing
@@ -194,50 +431,34 @@ class Sandbox:
         
         timeout = timeout or settings.sandbox_bash_timeout
         cwd = cwd or self.work_dir
+        stderr_limit = min(stderr_limit or _MAX_STREAM_CHARS, _MAX_STREAM_CHARS)
         
-        # Build the full command
-        full_command = f"cd {cwd} && {command}"
-        
-        # Prepare environment
-        env_str = ""
-        if env:
-            env_str = " ".join(f"{k}={v}" for k, v in env.items()) + " "
+        # Working directory and environment go through the exec API, so the
+        # command needs no `cd` prefix and values need no shell quoting
+        exec_command = ["bash", "-c", command]
         
-        exec_command = ["bash", "-c", f"{env_str}{full_command}"]
-        
-        start_time = datetime.utcnow()
+        start_ns = time.perf_counter_ns()
         
         try:
             # Execute with timeout
-            exec_result = await asyncio.wait_for(
-                asyncio.to_thread(
-                    self._container.exec_run,
-                    exec_command,
-                    workdir=cwd,
-                    demux=True,
-                ),
+            exit_code, stdout, stderr = await asyncio.wait_for(
+                self._exec(exec_command, cwd, env, stderr_limit),
                 timeout=timeout,
             )
             
-            end_time = datetime.utcnow()
-            duration_ms = int((end_time - start_time).total_seconds() * 1000)
-            
-            stdout_raw, stderr_raw = exec_result.output
-            stdout = (stdout_raw or b"").decode("utf-8", errors="replace")
-            stderr = (stderr_raw or b"").decode("utf-8", errors="replace")
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             # Truncate if too large
-            max_size = 50000  # 50KB per stream
             truncated = False
-            if len(stdout) > max_size:
-                stdout = stdout[:max_size] + "\n... [truncated]"
+            if len(stdout) > _MAX_STREAM_CHARS:
+                stdout = stdout[:_MAX_STREAM_CHARS] + "\n... [truncated]"
                 truncated = True
-            if len(stderr) > max_size:
-                stderr = stderr[:max_size] + "\n... [truncated]"
+            if len(stderr) > stderr_limit:
+                stderr = stderr[:stderr_limit] + "\n... [truncated]"
                 truncated = True
             
             return BashResult(
-                exit_code=exec_result.exit_code,
+                exit_code=exit_code,
                 stdout=stdout,
                 stderr=stderr,
                 duration_ms=duration_ms,
@@ -245,8 +466,7 @@ class Sandbox:
             )
         
         except asyncio.TimeoutError:
-            end_time = datetime.utcnow()
-            duration_ms = int((end_time - start_time).total_seconds() * 1000)
+            duration_ms = (time.perf_counter_ns() - start_ns) // 1_000_000
             
             return BashResult(
                 exit_code=-1,
@@ -264,6 +484,32 @@ class Sandbox:
                 duration_ms=0,
             )
     
+    async def _exec(
+        self,
+        cmd: list[str],
+        workdir: str,
+        env: dict[str, str] | None = None,
+        stderr_limit: int = _MAX_STREAM_CHARS,
+    ) -> tuple[int, str, str]:
+        """
+        Run a command via the exec API, returning (exit_code, stdout, stderr).
+        
+        Output is decoded as it streams in and kept only up to the output
+        cap; the rest is drained and dropped so memory stays bounded.
+        """
+        exec_ = await self._container.exec(
+            cmd=cmd, stdout=True, stderr=True, workdir=workdir, environment=env
+        )
+        
+        stdout = _CappedDecoder(_MAX_STREAM_CHARS)
+        stderr = _CappedDecoder(stderr_limit)
+        async with exec_.start(detach=False) as stream:
+            while (msg := await stream.read_out()) is not None:
+                (stdout if msg.stream == 1 else stderr).feed(msg.data)
+        
+        info = await exec_.inspect()
+        return info["ExitCode"], stdout.text(), stderr.text()
+    
     async def read_file(
         self,
         file_path: str,
@@ -273,6 +519,9 @@ class Sandbox:
         """
         Read a file from the sandbox.
         
+        The file is fetched as raw bytes through the Docker archive API; line
+        ranges are sliced locally.
+        
         Args:
             file_path: Path to the file (relative to work_dir or absolute)
             start_line: Starting line number (1-indexed, optional)
@@ -281,72 +530,155 @@ class Sandbox:
         Returns:
             File contents (or specified lines)
         """
+        if not self._started or not self._container:
+            raise RuntimeError("Sandbox not started")
+        
         if not file_path.startswith("/"):
             file_path = f"{self.work_dir}/{file_path}"
         
+        try:
+            archive = await _api_call(self._container.get_archive(file_path), "get_archive")
+        except DockerError as e:
+            raise FileNotFoundError(f"Cannot read file: {file_path}\n{e}")
+        
+        with archive:
+            member = archive.next()
+            if member is not None and member.issym():
+                # The archive holds the link itself; read its resolved target
+                result = await self.bash(f"readlink -e -- {shlex.quote(file_path)}")
+                target = result.stdout.strip()
+                if result.exit_code != 0 or not target:
+                    raise FileNotFoundError(f"Cannot read file: {file_path}\nBroken symlink")
+                return await self.read_file(target, start_line, end_line)
+            if member is None or not member.isfile():
+                raise FileNotFoundError(f"Cannot read file: {file_path}\nNot a regular file")
+            content = archive.extractfile(member).read().decode("utf-8", errors="replace")
+        
         if start_line is not None and end_line is not None:
-            # Use sed to extract specific lines
-            result = await self.bash(f"sed -n '{start_line},{end_line}p' {file_path}")
-        else:
-            result = await self.bash(f"cat {file_path}")
+            content = "".join(content.splitlines(keepends=True)[start_line - 1:end_line])
         
-        if result.exit_code != 0:
-            raise FileNotFoundError(f"Cannot read file: {file_path}\n{result.stderr}")
+        # Same output cap as bash()
+        if len(content) > _MAX_STREAM_CHARS:
+            content = content[:_MAX_STREAM_CHARS] + "\n... [truncated]"
         
-        return result.stdout
+        return content
     
     async def write_file(self, file_path: str, content: str) -> None:
         """
         Write content to a file in the sandbox.
         
+        The content is streamed as a single-file tar through the Docker
+        archive API; missing parent directories are created first, as the
+        container user.
+        
         Args:
             file_path: Path to the file (relative to work_dir or absolute)
             content: Content to write
         """
-        if not file_path.startswith("/"):
-            file_path = f"{self.work_dir}/{file_path}"
+        await self.write_files({file_path: content})
+    
+    async def write_files(self, files: dict[str, str]) -> None:
+        """
+        Write several files to the sandbox with one archive upload.
         
-        # Ensure parent directory exists
-        parent_dir = os.path.dirname(file_path)
-        await self.bash(f"mkdir -p {parent_dir}")
+        Args:
+            files: Content keyed by path (relative to work_dir or absolute)
+        """
+        if not self._started or not self._container:
+            raise RuntimeError("Sandbox not started")
         
-        # Write content using heredoc
-        # Escape content for bash
-        escaped_content = content.replace("\\", "\\\\").replace("'", "'\"'\"'")
+        paths = [
+            file_path if file_path.startswith("/") else f"{self.work_dir}/{file_path}"
+            for file_path in files
+        ]
+        uid, gid = await self._file_owner()
+        targets = await self._write_targets(paths)
+        mtime = int(time.time())
         
-        result = await self.bash(f"cat > {file_path} << 'SSREOF'\n{content}\nSSREOF")
+        buffer = io.BytesIO()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            for file_path, content in zip(paths, files.values()):
+                # Write through symlinks and keep an existing file's mode
+                # (e.g. its execute bit), as `cat >` would
+                target, mode = targets.get(file_path, (file_path, None))
+                data = content.encode("utf-8")
+                info = tarfile.TarInfo(name=target.lstrip("/"))
+                info.size = len(data)
+                info.mode = mode if mode is not None else 0o644
+                info.uid = uid
+                info.gid = gid
+                info.mtime = mtime
+                tar.addfile(info, io.BytesIO(data))
         
-        if result.exit_code != 0:
-            raise IOError(f"Cannot write file: {file_path}\n{result.stderr}")
+        try:
+            await _api_call(self._container.put_archive("/", buffer.getvalue()), "put_archive")
+        except DockerError as e:
+            raise IOError(f"Cannot write files: {', '.join(files)}\n{e}")
+    
+    async def _write_targets(self, paths: list[str]) -> dict[str, tuple[str, int | None]]:
+        """
+        Resolve each path through symlinks and get the mode of the file
+        there, if one exists, in a single exec.
+        
+        Missing parent directories are created in the same exec, so they are
+        owned by the container user (put_archive would create them as root).
+        """
+        quoted = " ".join(shlex.quote(p) for p in paths)
+        result = await self.bash(
+            f"for f in {quoted}; do "
+            f"mkdir -p -- \"$(dirname -- \"$f\")\" 2>/dev/null; "
+            f"printf '%s\\0%s\\0' \"$(readlink -f -- \"$f\" || printf %s \"$f\")\" "
+            f"\"$(stat -L -c %a -- \"$f\" 2>/dev/null)\"; done"
+        )
+        fields = result.stdout.split("\0")
+        if result.exit_code != 0 or len(fields) != 2 * len(paths) + 1:
+            return {}
+        return {
+            path: (target or path, int(mode, 8) if mode else None)
+            for path, target, mode in zip(paths, fields[0::2], fields[1::2])
+        }
+    
+    async def _file_owner(self) -> tuple[int, int]:
+        """Get the container user's (uid, gid), used as owner of written files."""
+        if self._file_owner_ids is None:
+            result = await self.bash("id -u && id -g")
+            try:
+                uid, gid = (int(x) for x in result.stdout.split())
+            except ValueError:
+                uid, gid = 0, 0
+            self._file_owner_ids = (uid, gid)
+        return self._file_owner_ids
     
     async def edit(self, operations: list[EditOperation]) -> list[EditResult]:
         """
         Apply edit operations to files in the sandbox.
         
         Supports: replace, insert, delete, apply_diff, search_replace
+        
+        Consecutive replace/insert/delete/search_replace operations run as a
+        single in-container batch (one exec); apply_diff runs on its own.
         """
         results = []
+        batch: list[tuple[str, EditOperation]] = []
         
         for op in operations:
             file_path = op.file_path
             if not file_path.startswith("/"):
                 file_path = f"{self.work_dir}/{file_path}"
             
+            if op.type in _BATCHED_EDIT_TYPES:
+                batch.append((file_path, op))
+                continue
+            
+            # Flush pending batch first to preserve operation order
+            if batch:
+                results.extend(await self._apply_edit_batch(batch))
+                batch = []
+            
             try:
-                if op.type == "replace":
-                    # Replace entire file content
-                    await self.write_file(file_path, op.args["content"])
-                    results.append(EditResult(success=True, file_path=file_path))
-                
-                elif op.type == "apply_diff":
+                if op.type == "apply_diff":
                     # Apply a unified diff patch
-                    diff_content = op.args["diff"]
-                    # Write diff to temp file
-                    temp_diff = f"/tmp/patch_{uuid4().hex[:8]}.diff"
-                    await self.write_file(temp_diff, diff_content)
-                    
-                    # Apply the patch
-                    result = await self.bash(f"patch -p1 < {temp_diff}", cwd=self.work_dir)
+                    result = await self._patch(op.args["diff"])
                     
                     if result.exit_code != 0:
                         results.append(EditResult(
@@ -357,63 +689,6 @@ class Sandbox:
                     else:
                         results.append(EditResult(success=True, file_path=file_path))
                 
-                elif op.type == "search_replace":
-                    # Search and replace in file
-                    old_text = op.args["old_text"]
-                    new_text = op.args["new_text"]
-                    
-                    # Read file, replace, write back
-                    content = await self.read_file(file_path)
-                    new_content = content.replace(old_text, new_text)
-                    await self.write_file(file_path, new_content)
-                    
-                    lines_changed = content.count(old_text)
-                    results.append(EditResult(
-                        success=True,
-                        file_path=file_path,
-                        lines_changed=lines_changed,
-                    ))
-                
-                elif op.type == "insert":
-                    # Insert text at line
-                    line_num = op.args["line"]
-                    text = op.args["text"]
-                    
-                    result = await self.bash(
-                        f"sed -i '{line_num}i\\{text}' {file_path}"
-                    )
-                    
-                    if result.exit_code != 0:
-                        results.append(EditResult(
-                            success=False,
-                            file_path=file_path,
-                            error=result.stderr,
-                        ))
-                    else:
-                        results.append(EditResult(success=True, file_path=file_path))
-                
-                elif op.type == "delete":
-                    # Delete lines from file
-                    start_line = op.args["start_line"]
-                    end_line = op.args.get("end_line", start_line)
-                    
-                    result = await self.bash(
-                        f"sed -i '{start_line},{end_line}d' {file_path}"
-                    )
-                    
-                    if result.exit_code != 0:
-                        results.append(EditResult(
-                            success=False,
-                            file_path=file_path,
-                            error=result.stderr,
-                        ))
-                    else:
-                        results.append(EditResult(
-                            success=True,
-                            file_path=file_path,
-                            lines_changed=end_line - start_line + 1,
-                        ))
-                
                 else:
                     results.append(EditResult(
                         success=False,
@@ -428,8 +703,49 @@ class Sandbox:
                     error=str(e),
                 ))
         
+        if batch:
+            results.extend(await self._apply_edit_batch(batch))
+        
         return results
     
+    async def _apply_edit_batch(
+        self,
+        batch: list[tuple[str, EditOperation]],
+    ) -> list[EditResult]:
+        """Run a batch of in-place edit operations in one exec."""
+        payload = json.dumps([
+            {"type": op.type, "file_path": file_path, "args": op.args}
+            for file_path, op in batch
+        ])
+        
+        # The payload is uploaded as a file rather than passed in the bash -c
+        # argument, which the kernel caps at 128 KiB
+        payload_path = f"{_SCRATCH_DIR}/ssr-edit-{uuid4().hex}.json"
+        await self.write_file(payload_path, payload)
+        result = await self.bash(
+            f"python3 -c {shlex.quote(_EDIT_SCRIPT)} < {payload_path}; "
+            f"status=$?; rm -f {payload_path}; exit $status"
+        )
+        
+        try:
+            outcomes = json.loads(result.stdout)
+        except ValueError:
+            error = result.stderr or result.stdout or "Edit batch failed"
+            return [
+                EditResult(success=False, file_path=file_path, error=error)
+                for file_path, _ in batch
+            ]
+        
+        return [
+            EditResult(
+                success=outcome["success"],
+                file_path=file_path,
+                error=outcome.get("error"),
+                lines_changed=outcome["lines_changed"],
+            )
+            for (file_path, _), outcome in zip(batch, outcomes)
+        ]
+    
     async def list_dir(self, path: str = ".") -> list[dict[str, Any]]:
         """
         List directory contents.
@@ -439,25 +755,28 @@ class Sandbox:
         if not path.startswith("/"):
             path = f"{self.work_dir}/{path}"
         
-        result = await self.bash(f"ls -la {path}")
+        # Tab-separated type/size/mode/name: no `ls` column parsing, and names
+        # with spaces survive intact
+        result = await self.bash(
+            f"find {shlex.quote(path)} -mindepth 1 -maxdepth 1 -printf '%y\\t%s\\t%M\\t%P\\n'"
+        )
         
         if result.exit_code != 0:
             raise FileNotFoundError(f"Cannot list directory: {path}\n{result.stderr}")
         
         entries = []
-        for line in result.stdout.strip().split("\n")[1:]:  # Skip "total" line
-            parts = line.split()
-            if len(parts) >= 9:
-                entry_type = "directory" if parts[0].startswith("d") else "file"
-                name = " ".join(parts[8:])
-                if name not in [".", ".."]:
-                    entries.append({
-                        "name": name,
-                        "type": entry_type,
-                        "size": int(parts[4]) if parts[4].isdigit() else 0,
-                        "permissions": parts[0],
-                    })
+        for line in result.stdout.splitlines():
+            parts = line.split("\t", 3)
+            if len(parts) == 4:
+                file_type, size, permissions, name = parts
+                entries.append({
+                    "name": name,
+                    "type": "directory" if file_type == "d" else "file",
+                    "size": int(size) if size.isdigit() else 0,
+                    "permissions": permissions,
+                })
         
+        entries.sort(key=lambda entry: entry["name"])
         return entries
     
     async def find_files(self, pattern: str, path: str = ".") -> list[str]:
@@ -474,39 +793,62 @@ class Sandbox:
         if not path.startswith("/"):
             path = f"{self.work_dir}/{path}"
         
-        result = await self.bash(f"find {path} -name '{pattern}' -type f 2>/dev/null")
+        result = await self.bash(
+            f"find {shlex.quote(path)} -name {shlex.quote(pattern)} -type f "
+            f"-printf '%P\\n' 2>/dev/null"
+        )
         
         if result.exit_code != 0 and result.stderr:
             return []
         
-        files = [
-            f.strip().replace(f"{self.work_dir}/", "")
-            for f in result.stdout.strip().split("\n")
-            if f.strip()
-        ]
+        # find prints paths relative to the search root; re-anchor them to
+        # work_dir (or keep them absolute when searching outside it)
+        root = posixpath.normpath(path)
+        if root == self.work_dir or root.startswith(f"{self.work_dir}/"):
+            root = posixpath.relpath(root, self.work_dir)
         
-        return files
+        if root == ".":
+            return [f for f in result.stdout.splitlines() if f]
+        return [f"{root}/{f}" for f in result.stdout.splitlines() if f]
     
     async def git_init(self) -> None:
         """Initialize or reinitialize git repository (used for solver leak prevention)."""
-        # Remove existing .git if present
-        await self.bash("rm -rf .git")
-        
-        # Initialize fresh repo
-        await self.bash("git init")
-        await self.bash("git config user.email 'ssr@studio.local'")
-        await self.bash("git config user.name 'SSR Studio'")
+        # Remove existing .git and initialize a fresh repo in one exec
+        await self.bash(
+            "rm -rf .git && git init -q && "
+            "git config user.email 'ssr@studio.local' && "
+            "git config user.name 'SSR Studio'"
+        )
     
     async def git_tag(self, tag_name: str) -> None:
         """Create a git tag at current state."""
-        await self.bash("git add -A")
-        await self.bash("git commit -m 'SSR checkpoint' --allow-empty")
-        await self.bash(f"git tag {tag_name}")
+        tag = _checked_tag(tag_name)
+        await self.bash(
+            f"git add -A && git commit -q -m 'SSR checkpoint' --allow-empty && git tag {tag}"
+        )
+    
+    async def git_reset_to_tag(self, tag_name: str) -> None:
+        """
+        Reset the workspace to a git tag in a single exec.
+        
+        Resets tracked files and removes untracked ones (e.g. leftover patch
+        files). Ignored files such as build outputs are left in place.
+        """
+        tag = _checked_tag(tag_name)
+        await self.bash(f"git reset -q --hard {tag} && git clean -fdq")
     
     async def git_restore_from_tag(self, tag_name: str, files: list[str]) -> None:
-        """Restore specific files from a git tag."""
-        for file_path in files:
-            await self.bash(f"git checkout {tag_name} -- {file_path}")
+        """
+        Restore specific files from a git tag.
+        
+        Paths are passed to a single ``git checkout`` per chunk of
+        ``_GIT_PATHS_PER_CALL`` files to keep exec round trips (and argv
+        length) bounded.
+        """
+        tag = _checked_tag(tag_name)
+        for i in range(0, len(files), _GIT_PATHS_PER_CALL):
+            paths = " ".join(shlex.quote(f) for f in files[i:i + _GIT_PATHS_PER_CALL])
+            await self.bash(f"git checkout {tag} -- {paths}")
     
     async def apply_diff(self, diff_content: str, reverse: bool = False) -> bool:
         """
@@ -519,32 +861,134 @@ class Sandbox:
         Returns:
             True if patch applied successfully
         """
+        result = await self._patch(diff_content, reverse)
+        return result.exit_code == 0
+    
+    async def _patch(self, diff_content: str, reverse: bool = False) -> BashResult:
+        """
+        Apply a diff from work_dir: upload it via the archive API, then patch
+        and remove the temp file in a single exec.
+        """
         temp_diff = f"/tmp/patch_{uuid4().hex[:8]}.diff"
         await self.write_file(temp_diff, diff_content)
         
-        reverse_flag = "-R" if reverse else ""
-        result = await self.bash(f"patch -p1 {reverse_flag} < {temp_diff}")
-        
-        return result.exit_code == 0
+        reverse_flag = "-R " if reverse else ""
+        return await self.bash(
+            f"patch -p1 {reverse_flag}< {temp_diff}; status=$?; rm -f {temp_diff}; exit $status",
+            cwd=self.work_dir,
+        )
     
     async def create_diff(self, base_tag: str = "HEAD") -> str:
         """Create a unified diff of all changes since a tag/commit."""
         result = await self.bash(f"git diff {base_tag}")
         return result.stdout
     
-    async def get_image_digest(self) -> str | None:
-        """Get the digest of the Docker image."""
+    async def snapshot_workspace(self) -> bool:
+        """
+        Save the current workspace (including any .git) for later resets.
+        
+        The archive is spooled to a temp file on the host, out of reach of
+        commands run in the sandbox and out of host memory.
+        
+        Returns:
+            True if the snapshot was taken
+        """
+        if not self._started or not self._container:
+            raise RuntimeError("Sandbox not started")
+        
+        try:
+            archive = await _api_call(
+                self._container.get_archive(self.work_dir),
+                "get_archive",
+                timeout=settings.sandbox_bash_timeout,
+            )
+        except (DockerError, DockerDaemonTimeout) as e:
+            logger.warning(
+                "Cannot snapshot workspace", sandbox_id=str(self.sandbox_id), error=str(e)
+            )
+            return False
+        
+        snapshot = await asyncio.to_thread(_spool_archive, archive)
+        if self._workspace_snapshot is not None:
+            self._workspace_snapshot.close()
+        self._workspace_snapshot = snapshot
+        return True
+    
+    async def restore_workspace(self) -> bool:
+        """
+        Reset the sandbox to the state saved by snapshot_workspace().
+        
+        Stray processes are killed, the workspace and /tmp are emptied and
+        the saved workspace is uploaded again. Changes elsewhere in the
+        filesystem are not undone; see has_outside_changes().
+        
+        Returns:
+            True if the sandbox was restored successfully
+        """
+        if self._workspace_snapshot is None or not self._container:
+            return False
+        
+        # kill -1 spares PID 1 and the calling shell
+        result = await self.bash(
+            f"kill -9 -1 2>/dev/null; "
+            f"find {self.work_dir} {_SCRATCH_DIR} -mindepth 1 -delete"
+        )
+        if result.exit_code != 0:
+            return False
+        
+        try:
+            data = await asyncio.to_thread(_read_spool, self._workspace_snapshot)
+            await _api_call(
+                self._container.put_archive(self.work_dir.rsplit("/", 1)[0] or "/", data),
+                "put_archive",
+                timeout=settings.sandbox_bash_timeout,
+            )
+        except (OSError, DockerError, DockerDaemonTimeout) as e:
+            logger.warning(
+                "Cannot restore workspace", sandbox_id=str(self.sandbox_id), error=str(e)
+            )
+            return False
+        return True
+    
+    async def has_outside_changes(self) -> bool:
+        """
+        Check whether the container's filesystem differs from its image
+        outside the workspace and /tmp (e.g. packages installed by an agent).
+        
+        Asks the Docker daemon, so commands run in the sandbox cannot hide
+        changes. Returns True if the check itself fails.
+        """
         if not self._container:
-            return None
+            return True
         
         try:
-            image = await asyncio.to_thread(
-                self._client.images.get,
-                self.image_ref,
+            changes = await _api_call(
+                _container_changes(self._client, self._container.id),
+                "container changes",
             )
-            return image.id
         except Exception:
+            return True
+        
+        kept = (self.work_dir, _SCRATCH_DIR)
+        return not all(
+            any(change["Path"] == root or change["Path"].startswith(f"{root}/") for root in kept)
+            for change in changes or ()
+        )
+    
+    async def get_image_digest(self) -> str | None:
+        """Get the digest of the Docker image (looked up once per started container)."""
+        if not self._container:
             return None
+        
+        if self._image_digest is None:
+            try:
+                image = await _api_call(
+                    self._client.images.inspect(self.image_ref), "image inspect"
+                )
+                self._image_digest = image["Id"]
+            except Exception:
+                return None
+        return self._image_digest
     
     async def __aenter__(self) -> "Sandbox":
         """Context manager entry."""
@@ -560,65 +1004,187 @@ class SandboxPool:
     """
     Pool of sandbox instances for parallel episode execution.
     
-    Manages creation, reuse, and cleanup of sandbox containers.
+    Manages creation, reuse, and cleanup of sandbox containers. Released
+    sandboxes are reset (processes killed, workspace restored from a
+    host-side snapshot, /tmp emptied) and kept for reuse, which is much
+    cheaper than starting a new container. Containers whose filesystem was
+    changed anywhere else are destroyed instead, and each container is
+    retired after ``max_reuses`` uses.
     """
     
-    def __init__(self, max_sandboxes: int = 10):
-        self.max_sandboxes = max_sandboxes
-        self._available: dict[str, list[Sandbox]] = {}
+    def __init__(self, max_sandboxes: int | None = None, max_reuses: int | None = None):
+        self.max_sandboxes = max_sandboxes or settings.sandbox_pool_max_sandboxes
+        self.max_reuses = max_reuses or settings.sandbox_pool_max_reuses
+        # Released sandboxes, oldest first; they count toward max_sandboxes
+        self._idle: OrderedDict[UUID, Sandbox] = OrderedDict()
         self._in_use: set[UUID] = set()
+        self._uses: dict[UUID, int] = {}
         self._lock = asyncio.Lock()
+        # Notified (under _lock) whenever a slot frees up or a sandbox is returned
+        self._capacity = asyncio.Condition(self._lock)
+        self._docker_client: aiodocker.Docker | None = None
     
-    async def acquire(self, image_ref: str) -> Sandbox:
+    async def acquire(
+        self,
+        image_ref: str,
+        wait: bool = True,
+    ) -> Sandbox:
         """
         Acquire a sandbox for the given image.
         
-        Returns a new or recycled sandbox instance.
+        When the pool is full, waits for a sandbox to be released, or raises
+        RuntimeError if ``wait`` is False. Callers that already hold a
+        sandbox should not wait, or episodes can deadlock on each other.
+        
+        Returns a new or recycled sandbox instance with a pristine workspace.
         """
-        async with self._lock:
-            # Check for available sandbox with this image
-            if image_ref in self._available and self._available[image_ref]:
-                sandbox = self._available[image_ref].pop()
-                self._in_use.add(sandbox.sandbox_id)
-                return sandbox
-            
+        evicted: Sandbox | None = None
+        async with self._capacity:
+            while True:
+                # Reuse the most recently released sandbox for this image
+                sandbox = next(
+                    (idle for idle in reversed(self._idle.values()) if idle.image_ref == image_ref),
+                    None,
+                )
+                if sandbox is not None:
+                    del self._idle[sandbox.sandbox_id]
+                    self._in_use.add(sandbox.sandbox_id)
+                    break
+                
+                # Make room by evicting the longest-idle sandbox (of another image)
+                if self._idle and len(self._in_use) + len(self._idle) >= self.max_sandboxes:
+                    _, evicted = self._idle.popitem(last=False)
+                    self._uses.pop(evicted.sandbox_id, None)
+                
+                # Reserve a slot; the container is started outside the lock
+                if len(self._in_use) + len(self._idle) < self.max_sandboxes:
+                    reservation = uuid4()
+                    self._in_use.add(reservation)
+                    break
+                
+                if not wait:
+                    raise RuntimeError("Maximum sandbox limit reached")
+                await self._capacity.wait()
+        
+        if sandbox is None:
             # Create new sandbox
-            if len(self._in_use) >= self.max_sandboxes:
-                raise RuntimeError("Maximum sandbox limit reached")
+            try:
+                if evicted is not None:
+                    await evicted.stop()
+                sandbox = await self._start_sandbox(image_ref)
+                if not await sandbox.snapshot_workspace():
+                    raise RuntimeError("Failed to snapshot sandbox workspace")
+            except BaseException:
+                async with self._lock:
+                    self._in_use.discard(reservation)
+                    self._capacity.notify_all()
+                if sandbox is not None:
+                    await sandbox.stop()
+                raise
             
-            sandbox = Sandbox(image_ref=image_ref)
-            await sandbox.start()
-            self._in_use.add(sandbox.sandbox_id)
+            async with self._lock:
+                self._in_use.discard(reservation)
+                self._in_use.add(sandbox.sandbox_id)
             
-            return sandbox
+        # Recycled sandboxes were reset when they were released
+        return sandbox
+    
+    def _get_docker_client(self) -> aiodocker.Docker:
+        """Get the Docker client (connection pool) shared by all pooled sandboxes."""
+        if self._docker_client is None:
+            self._docker_client = aiodocker.Docker(url=settings.docker_host)
+        return self._docker_client
+    
+    async def _start_sandbox(self, image_ref: str) -> Sandbox:
+        """Start a new sandbox, retrying once with a fresh container on daemon timeout."""
+        client = self._get_docker_client()
+        try:
+            sandbox = Sandbox(image_ref=image_ref, docker_client=client)
+            await sandbox.start()
+        except DockerDaemonTimeout as e:
+            logger.warning("Docker daemon timeout starting sandbox, retrying", error=str(e))
+            sandbox = Sandbox(image_ref=image_ref, docker_client=client)
+            await sandbox.start()
+        return sandbox
     
-    async def release(self, sandbox: Sandbox, recycle: bool = False) -> None:
+    @asynccontextmanager
+    async def lease(
+        self,
+        image_ref: str,
+        wait: bool = True,
+    ) -> AsyncIterator[Sandbox]:
+        """Acquire a sandbox for the duration of a block and recycle it afterwards."""
+        sandbox = await self.acquire(image_ref, wait)
+        try:
+            yield sandbox
+        finally:
+            await self.release(sandbox)
+    
+    async def release(self, sandbox: Sandbox, recycle: bool = True) -> None:
         """
         Release a sandbox back to the pool.
         
         Args:
             sandbox: The sandbox to release
-            recycle: If True, keep the sandbox for reuse; otherwise destroy it
+            recycle: If True, reset and keep the sandbox for reuse; otherwise
+                destroy it. Sandboxes past ``max_reuses``, that fail to
+                reset or that were changed outside the workspace are
+                destroyed regardless.
         """
+        sandbox_id = sandbox.sandbox_id
+        uses = self._uses.get(sandbox_id, 0) + 1
+        
+        if recycle and uses >= self.max_reuses:
+            recycle = False
+        elif recycle and (
+            # Restore first so no leftover process can write after the check
+            not await sandbox.restore_workspace() or await sandbox.has_outside_changes()
+        ):
+            logger.warning("Discarding unrecyclable sandbox", sandbox_id=str(sandbox_id))
+            recycle = False
+        
         async with self._lock:
-            self._in_use.discard(sandbox.sandbox_id)
+            self._in_use.discard(sandbox_id)
             
             if recycle:
                 # Add to available pool
-                if sandbox.image_ref not in self._available:
-                    self._available[sandbox.image_ref] = []
-                self._available[sandbox.image_ref].append(sandbox)
+                self._uses[sandbox_id] = uses
+                self._idle[sandbox_id] = sandbox
             else:
-                # Destroy the sandbox
-                await sandbox.stop()
+                self._uses.pop(sandbox_id, None)
+            self._capacity.notify_all()
+        
+        if not recycle:
+            # Destroy the sandbox
+            await sandbox.stop()
     
     async def cleanup(self) -> None:
         """Clean up all sandboxes in the pool."""
         async with self._lock:
-            for sandboxes in self._available.values():
-                for sandbox in sandboxes:
-                    await sandbox.stop()
-            self._available.clear()
+            sandboxes = list(self._idle.values())
+            self._idle.clear()
+            for sandbox in sandboxes:
+                self._uses.pop(sandbox.sandbox_id, None)
+            
+            client = None
+            if self._docker_client and not self._in_use:
+                client, self._docker_client = self._docker_client, None
+        
+        # Stop containers concurrently (outside the lock), capped at pool size
+        semaphore = asyncio.Semaphore(self.max_sandboxes)
+        await asyncio.gather(
+            *(self._stop_bounded(sandbox, semaphore) for sandbox in sandboxes),
+            return_exceptions=True,
+        )
+        
+        if client:
+            await client.close()
+    
+    @staticmethod
+    async def _stop_bounded(sandbox: Sandbox, semaphore: asyncio.Semaphore) -> None:
+        """Stop a sandbox while holding a slot of the given semaphore."""
+        async with semaphore:
+            await sandbox.stop()
 
 
 # Global sandbox pool
@@ -4,19 +4,218 @@ Artifact storage backend for SSR Studio.
 Supports local filesystem and S3-compatible object storage.
 """
 
+import asyncio
+import functools
+import gzip
 import io
+import os
 import tarfile
+import threading
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from pathlib import Path
-from typing import AsyncIterator
+from typing import AsyncIterator, Iterable
 from uuid import UUID
 
-import aiofiles
-import aiofiles.os
+import boto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
 
 from ssr_studio.config import settings
 
 
+# =============================================================================
+# Local File Helpers (each runs in one worker thread hop)
+# =============================================================================
+
+def _write_file(path: str, content: str | bytes) -> None:
+    """Create parent directories and write a file."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    mode = "w" if isinstance(content, str) else "wb"
+    with open(path, mode) as f:
+        f.write(content)
+
+
+def _read_file(path: str, mode: str) -> str | bytes:
+    """Read a whole file in text ("r") or binary ("rb") mode."""
+    with open(path, mode) as f:
+        return f.read()
+
+
+def _delete_file(path: str) -> None:
+    """Delete a file if it exists."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _list_files(root: str, base: str) -> list[str]:
+    """List files under ``root`` as paths relative to ``base``."""
+    offset = len(base.rstrip(os.sep)) + 1
+    files = []
+    stack = [root]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry.path[offset:])
+        except (FileNotFoundError, NotADirectoryError):
+            pass
+    return files
+
+
+# =============================================================================
+# Read Cache
+# =============================================================================
+
+class _ReadCache:
+    """
+    LRU of file contents bounded by total length.
+    
+    Artifact files are write-once, so entries only need dropping when a
+    key is rewritten or deleted through the same backend. Only touched
+    from the event loop, so no locking is needed.
+    """
+    
+    def __init__(self, max_size: int):
+        self._max_size = max_size
+        self._size = 0
+        self._entries: OrderedDict[tuple[str, str], str | bytes] = OrderedDict()
+    
+    def get(self, key: str, mode: str) -> str | bytes | None:
+        value = self._entries.get((key, mode))
+        if value is not None:
+            self._entries.move_to_end((key, mode))
+        return value
+    
+    def put(self, key: str, mode: str, value: str | bytes) -> None:
+        if len(value) > self._max_size:
+            return
+        self._pop((key, mode))
+        self._entries[(key, mode)] = value
+        self._size += len(value)
+        while self._size > self._max_size:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+    
+    def invalidate(self, key: str) -> None:
+        for entry in [e for e in self._entries if e[0] == key]:
+            self._pop(entry)
+    
+    def _pop(self, entry: tuple[str, str]) -> None:
+        value = self._entries.pop(entry, None)
+        if value is not None:
+            self._size -= len(value)
+
+
+# =============================================================================
+# Tarball Streaming
+# =============================================================================
+
+# Size of chunks handed to the HTTP response; small chunks cost one queue
+# hop and one send per few KiB, so keep these large
+_TARBALL_CHUNK_SIZE = 256 * 1024
+
+# Files making up a stored artifact, in tarball order
+_ARTIFACT_FILES = (
+    "test_script.sh",
+    "test_files.txt",
+    "test_parser.py",
+    "bug_inject.diff",
+    "test_weaken.diff",
+)
+
+
+class _TarballCancelled(Exception):
+    """Raised in the tar writer thread when the reader has gone away."""
+
+
+class _QueueWriter:
+    """
+    Write-only file object that passes data from a worker thread to an
+    asyncio queue in ``chunk_size`` pieces, blocking while the queue is full.
+    """
+    
+    def __init__(self, queue: asyncio.Queue, loop: asyncio.AbstractEventLoop, chunk_size: int):
+        self._queue = queue
+        self._loop = loop
+        self._chunk_size = chunk_size
+        # Pieces are joined once per chunk instead of being appended to a
+        # growing buffer, so each byte is copied exactly once
+        self._pieces: list[bytes] = []
+        self._buffered = 0
+        self._cancelled = threading.Event()
+    
+    def write(self, data: bytes) -> int:
+        self._pieces.append(bytes(data))
+        self._buffered += len(data)
+        if self._buffered >= self._chunk_size:
+            self._flush()
+        return len(data)
+    
+    def close(self) -> None:
+        """Flush buffered data and signal end of stream."""
+        if self._pieces:
+            self._flush()
+        self._put(None)
+    
+    def _flush(self) -> None:
+        chunk = b"".join(self._pieces)
+        self._pieces.clear()
+        self._buffered = 0
+        self._put(chunk)
+    
+    def cancel(self) -> None:
+        """Make further writes fail (called from the event loop)."""
+        self._cancelled.set()
+    
+    def _put(self, item: bytes | None) -> None:
+        if self._cancelled.is_set():
+            raise _TarballCancelled()
+        asyncio.run_coroutine_threadsafe(self._queue.put(item), self._loop).result()
+
+
+def _write_tarball(
+    writer: _QueueWriter,
+    files: Iterable[tuple[str, bytes | str]],
+    compresslevel: int,
+) -> None:
+    """
+    Write files as a streamed (non-seeking) gzipped tar, then close the writer.
+    
+    Each file is given either as its contents or as a local path, which is
+    copied into the archive straight from disk.
+    """
+    try:
+        try:
+            # tarfile's "w|gz" is fixed at level 9 before Python 3.12, so
+            # gzip the plain tar stream ourselves at the configured level
+            with (
+                gzip.GzipFile(
+                    fileobj=writer, mode="wb", compresslevel=compresslevel, mtime=0
+                ) as gz,
+                tarfile.open(fileobj=gz, mode="w|") as tar,
+            ):
+                for name, source in files:
+                    info = tarfile.TarInfo(name=f"artifact/{name}")
+                    if isinstance(source, bytes):
+                        info.size = len(source)
+                        tar.addfile(info, io.BytesIO(source))
+                    else:
+                        with open(source, "rb") as f:
+                            info.size = os.fstat(f.fileno()).st_size
+                            tar.addfile(info, f)
+        finally:
+            # Always end the stream so the reader is never left waiting
+            writer.close()
+    except _TarballCancelled:
+        pass
+
+
 class StorageBackend(ABC):
     """Abstract base class for storage backends."""
     
@@ -62,42 +261,69 @@ class StorageBackend(ABC):
         """Write all artifact files and return references."""
         prefix = f"artifacts/{artifact_id}"
         
-        refs = {}
-        refs["test_script_ref"] = await self.write(f"{prefix}/test_script.sh", test_script)
-        refs["test_files_ref"] = await self.write(f"{prefix}/test_files.txt", "\n".join(test_files))
-        refs["test_parser_ref"] = await self.write(f"{prefix}/test_parser.py", test_parser)
-        refs["bug_inject_diff_ref"] = await self.write(f"{prefix}/bug_inject.diff", bug_inject_diff)
-        refs["test_weaken_diff_ref"] = await self.write(f"{prefix}/test_weaken.diff", test_weaken_diff)
+        script_ref, files_ref, parser_ref, bug_ref, weaken_ref = await asyncio.gather(
+            self.write(f"{prefix}/test_script.sh", test_script),
+            self.write(f"{prefix}/test_files.txt", "\n".join(test_files)),
+            self.write(f"{prefix}/test_parser.py", test_parser),
+            self.write(f"{prefix}/bug_inject.diff", bug_inject_diff),
+            self.write(f"{prefix}/test_weaken.diff", test_weaken_diff),
+        )
         
-        return refs
+        return {
+            "test_script_ref": script_ref,
+            "test_files_ref": files_ref,
+            "test_parser_ref": parser_ref,
+            "bug_inject_diff_ref": bug_ref,
+            "test_weaken_diff_ref": weaken_ref,
+        }
+    
+    async def _tarball_sources(self, prefix: str) -> list[bytes | str]:
+        """Fetch artifact file contents for the tarball, in ``_ARTIFACT_FILES`` order."""
+        return await asyncio.gather(
+            *(self.read_bytes(f"{prefix}/{name}") for name in _ARTIFACT_FILES)
+        )
     
     async def get_artifact_tarball(self, artifact_id: UUID) -> AsyncIterator[bytes]:
-        """Create a tarball of all artifact files."""
-        prefix = f"artifacts/{artifact_id}"
-        
-        files = {
-            "test_script.sh": await self.read(f"{prefix}/test_script.sh"),
-            "test_files.txt": await self.read(f"{prefix}/test_files.txt"),
-            "test_parser.py": await self.read(f"{prefix}/test_parser.py"),
-            "bug_inject.diff": await self.read(f"{prefix}/bug_inject.diff"),
-            "test_weaken.diff": await self.read(f"{prefix}/test_weaken.diff"),
-        }
+        """
+        Open a streamed tarball of all artifact files.
         
-        # Create in-memory tarball
-        buffer = io.BytesIO()
-        with tarfile.open(fileobj=buffer, mode="w:gz") as tar:
-            for name, content in files.items():
-                data = content.encode("utf-8") if isinstance(content, str) else content
-                info = tarfile.TarInfo(name=f"artifact/{name}")
-                info.size = len(data)
-                tar.addfile(info, io.BytesIO(data))
+        The files are fetched (local ones only checked) before this returns,
+        so a missing file raises here, before a response has started.
+        """
+        sources = await self._tarball_sources(f"artifacts/{artifact_id}")
+        return self._stream_tarball(sources)
+    
+    async def _stream_tarball(self, sources: list[bytes | str]) -> AsyncIterator[bytes]:
+        """
+        Stream the gzipped tar of the given sources.
         
-        buffer.seek(0)
+        The tar is produced in a worker thread and handed over through a
+        bounded queue, so chunks are sent while compression continues and
+        memory stays O(chunk).
+        """
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=4)
+        writer = _QueueWriter(queue, asyncio.get_running_loop(), chunk_size=_TARBALL_CHUNK_SIZE)
+        task = asyncio.ensure_future(
+            asyncio.to_thread(
+                _write_tarball,
+                writer,
+                zip(_ARTIFACT_FILES, sources),
+                settings.tarball_compresslevel,
+            )
+        )
         
-        # Yield chunks for streaming
-        chunk_size = 8192
-        while chunk := buffer.read(chunk_size):
-            yield chunk
+        try:
+            while (chunk := await queue.get()) is not None:
+                yield chunk
+            await task
+        finally:
+            if not task.done():
+                # Reader went away: stop the writer and unblock any pending put
+                writer.cancel()
+                while not task.done():
+                    while not queue.empty():
+                        queue.get_nowait()
+                    await asyncio.wait({task}, timeout=0.05)
 
 
 class LocalStorage(StorageBackend):
@@ -106,72 +332,80 @@ class LocalStorage(StorageBackend):
     def __init__(self, base_path: Path | None = None):
         self.base_path = base_path or settings.storage_path
         self.base_path.mkdir(parents=True, exist_ok=True)
+        # Keys are joined onto this with plain string concatenation
+        self._base_str = str(self.base_path).rstrip("/") + "/"
+        self._cache = _ReadCache(settings.artifact_cache_bytes)
     
-    def _get_path(self, key: str) -> Path:
+    def _get_path(self, key: str) -> str:
         """Get the full path for a key."""
-        return self.base_path / key
+        return self._base_str + key
+    
+    async def _read_cached(self, ref: str, mode: str) -> str | bytes:
+        """Read a file in the given mode, serving repeat reads from memory."""
+        path = ref if ref.startswith("/") else self._get_path(ref)
+        content = self._cache.get(path, mode)
+        if content is None:
+            content = await asyncio.to_thread(_read_file, path, mode)
+            self._cache.put(path, mode, content)
+        return content
     
     async def write(self, key: str, content: str | bytes) -> str:
-        """Write content to local filesystem."""
-        path = self._get_path(key)
-        path.parent.mkdir(parents=True, exist_ok=True)
-        
-        mode = "w" if isinstance(content, str) else "wb"
-        async with aiofiles.open(path, mode) as f:
-            await f.write(content)
+        """
+        Write content to local filesystem.
         
-        return str(path)
+        Returns the key itself as the reference rather than the absolute
+        path, so stored refs stay short and independent of ``base_path``.
+        Absolute refs written by older versions are still readable.
+        """
+        path = self._get_path(key)
+        await asyncio.to_thread(_write_file, path, content)
+        self._cache.invalidate(path)
+        return key
     
     async def read(self, ref: str) -> str:
         """Read content from local filesystem."""
-        path = Path(ref) if ref.startswith("/") else self._get_path(ref)
-        
-        async with aiofiles.open(path, "r") as f:
-            return await f.read()
+        return await self._read_cached(ref, "r")
     
     async def read_bytes(self, ref: str) -> bytes:
         """Read binary content from local filesystem."""
-        path = Path(ref) if ref.startswith("/") else self._get_path(ref)
-        
-        async with aiofiles.open(path, "rb") as f:
-            return await f.read()
+        return await self._read_cached(ref, "rb")
     
     async def exists(self, ref: str) -> bool:
         """Check if a file exists."""
-        path = Path(ref) if ref.startswith("/") else self._get_path(ref)
-        return await aiofiles.os.path.exists(path)
+        path = ref if ref.startswith("/") else self._get_path(ref)
+        return await asyncio.to_thread(os.path.exists, path)
     
     async def delete(self, ref: str) -> None:
         """Delete a file."""
-        path = Path(ref) if ref.startswith("/") else self._get_path(ref)
-        if await aiofiles.os.path.exists(path):
-            await aiofiles.os.remove(path)
+        path = ref if ref.startswith("/") else self._get_path(ref)
+        await asyncio.to_thread(_delete_file, path)
+        self._cache.invalidate(path)
     
     async def list_keys(self, prefix: str) -> list[str]:
         """List all files with the given prefix."""
-        path = self._get_path(prefix)
-        if not path.exists():
-            return []
-        
-        keys = []
-        for file_path in path.rglob("*"):
-            if file_path.is_file():
-                keys.append(str(file_path.relative_to(self.base_path)))
-        
-        return keys
+        return await asyncio.to_thread(
+            _list_files, self._get_path(prefix), self._base_str
+        )
+    
+    async def _tarball_sources(self, prefix: str) -> list[bytes | str]:
+        """Hand the tar writer file paths so contents are never read into memory."""
+        paths = [self._get_path(f"{prefix}/{name}") for name in _ARTIFACT_FILES]
+        # Stat up front so a missing file fails in get_artifact_tarball,
+        # before the endpoint starts the response
+        await asyncio.to_thread(lambda: [os.stat(path) for path in paths])
+        return paths
 
 
 class S3Storage(StorageBackend):
     """S3-compatible object storage backend."""
     
     def __init__(self):
-        import boto3
-        from botocore.config import Config
-        
         config = Config(
             connect_timeout=5,
             read_timeout=30,
-            retries={"max_attempts": 3},
+            retries={"max_attempts": 3, "mode": "standard"},
+            max_pool_connections=settings.s3_max_pool_connections,
+            tcp_keepalive=True,
         )
         
         kwargs = {
@@ -187,11 +421,17 @@ class S3Storage(StorageBackend):
         
         self.client = boto3.client("s3", **kwargs)
         self.bucket = settings.s3_bucket
+        self._cache = _ReadCache(settings.artifact_cache_bytes)
+    
+    def _split_ref(self, ref: str) -> tuple[str, str]:
+        """Split an ``s3://bucket/key`` URI (or a bare key) into bucket and key."""
+        if not ref.startswith("s3://"):
+            return self.bucket, ref
+        bucket, _, key = ref[5:].partition("/")
+        return bucket, key
     
     async def write(self, key: str, content: str | bytes) -> str:
         """Write content to S3."""
-        import asyncio
-        
         body = content.encode("utf-8") if isinstance(content, str) else content
         
         await asyncio.to_thread(
@@ -200,6 +440,7 @@ class S3Storage(StorageBackend):
             Key=key,
             Body=body,
         )
+        self._cache.invalidate(f"{self.bucket}/{key}")
         
         return f"s3://{self.bucket}/{key}"
     
@@ -210,37 +451,22 @@ class S3Storage(StorageBackend):
     
     async def read_bytes(self, ref: str) -> bytes:
         """Read binary content from S3."""
-        import asyncio
-        
-        # Parse S3 URI or use as key
-        if ref.startswith("s3://"):
-            parts = ref[5:].split("/", 1)
-            bucket = parts[0]
-            key = parts[1] if len(parts) > 1 else ""
-        else:
-            bucket = self.bucket
-            key = ref
-        
-        response = await asyncio.to_thread(
-            self.client.get_object,
-            Bucket=bucket,
-            Key=key,
-        )
-        
+        bucket, key = self._split_ref(ref)
+        cache_key = f"{bucket}/{key}"
+        content = self._cache.get(cache_key, "rb")
+        if content is None:
+            content = await asyncio.to_thread(self._get_object_bytes, bucket, key)
+            self._cache.put(cache_key, "rb", content)
+        return content
+    
+    def _get_object_bytes(self, bucket: str, key: str) -> bytes:
+        """Fetch an object and read its body; the body read is blocking socket I/O."""
+        response = self.client.get_object(Bucket=bucket, Key=key)
         return response["Body"].read()
     
     async def exists(self, ref: str) -> bool:
         """Check if an object exists in S3."""
-        import asyncio
-        from botocore.exceptions import ClientError
-        
-        if ref.startswith("s3://"):
-            parts = ref[5:].split("/", 1)
-            bucket = parts[0]
-            key = parts[1] if len(parts) > 1 else ""
-        else:
-            bucket = self.bucket
-            key = ref
+        bucket, key = self._split_ref(ref)
         
         try:
             await asyncio.to_thread(
@@ -254,47 +480,32 @@ class S3Storage(StorageBackend):
     
     async def delete(self, ref: str) -> None:
         """Delete an object from S3."""
-        import asyncio
-        
-        if ref.startswith("s3://"):
-            parts = ref[5:].split("/", 1)
-            bucket = parts[0]
-            key = parts[1] if len(parts) > 1 else ""
-        else:
-            bucket = self.bucket
-            key = ref
+        bucket, key = self._split_ref(ref)
         
         await asyncio.to_thread(
             self.client.delete_object,
             Bucket=bucket,
             Key=key,
         )
+        self._cache.invalidate(f"{bucket}/{key}")
     
     async def list_keys(self, prefix: str) -> list[str]:
         """List all objects with the given prefix."""
-        import asyncio
-        
-        response = await asyncio.to_thread(
-            self.client.list_objects_v2,
-            Bucket=self.bucket,
-            Prefix=prefix,
-        )
-        
-        return [obj["Key"] for obj in response.get("Contents", [])]
-
-
-# Global storage instance
-_storage: StorageBackend | None = None
+        return await asyncio.to_thread(self._list_keys, prefix)
+    
+    def _list_keys(self, prefix: str) -> list[str]:
+        """Collect keys across all list_objects_v2 pages (1000 keys each)."""
+        paginator = self.client.get_paginator("list_objects_v2")
+        return [
+            obj["Key"]
+            for page in paginator.paginate(Bucket=self.bucket, Prefix=prefix)
+            for obj in page.get("Contents", [])
+        ]
 
 
+@functools.cache
 def get_storage() -> StorageBackend:
-    """Get the configured storage backend."""
-    global _storage
-    
-    if _storage is None:
-        if settings.storage_backend == "s3":
-            _storage = S3Storage()
-        else:
-            _storage = LocalStorage()
-    
-    return _storage
+    """Get the configured storage backend (created once per process)."""
+    if settings.storage_backend == "s3":
+        return S3Storage()
+    return LocalStorage()
@@ -273,16 +273,16 @@ Returns a summary of passed/failed tests.""",
 # Tool Sets for Each Role
 # =============================================================================
 
-INJECTOR_TOOLS = [
+INJECTOR_TOOLS = (
     BASH_TOOL,
     READ_FILE_TOOL,
     EDIT_FILE_TOOL,
     LIST_DIR_TOOL,
     FIND_FILES_TOOL,
     SUBMIT_ARTIFACT_TOOL,
-]
+)
 
-SOLVER_TOOLS = [
+SOLVER_TOOLS = (
     BASH_TOOL,
     READ_FILE_TOOL,
     EDIT_FILE_TOOL,
@@ -291,4 +291,4 @@ SOLVER_TOOLS = [
     RUN_TESTS_TOOL,
     CREATE_DIFF_TOOL,
     SUBMIT_PATCH_TOOL,
-]
+)
@@ -13,13 +13,17 @@ Implements the SSR paper's validation checks (§2.3, Fig. 4):
 Each modified file in bug_inject.diff must contribute to test failures.
 """
 
-import json
+import asyncio
+import operator
 import re
+import shlex
 import time
+from contextlib import AsyncExitStack, asynccontextmanager
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, AsyncIterator
 from uuid import UUID
 
+import orjson
 import structlog
 
 from ssr_studio.config import settings, validator_config
@@ -30,16 +34,68 @@ from ssr_studio.models import (
     ValidationStepName,
     TestStatus,
 )
-from ssr_studio.sandbox import Sandbox
+from ssr_studio.sandbox import BashResult, Sandbox, sandbox_pool
 
 logger = structlog.get_logger()
 
+# Test files checked per sandbox exec; keeps the bash -c argument well
+# under the kernel's per-argument length limit
+_FILE_CHECK_BATCH = 500
+
+# Inverse mutation checkpoints: the original code plus test harness, and
+# the same with the bug applied
+_INVERSE_BASE_TAG = "ssr-inverse-base"
+_INVERSE_BUG_TAG = "ssr-inverse-bug"
+
+# Inverse mutation only needs the oracle-failing tests, so their ids are
+# offered to test_script.sh via this variable (newline separated); above
+# the size cap the variable is left unset and the full suite runs
+_TEST_FILTER_ENV = "SSR_TEST_FILTER"
+_TEST_FILTER_MAX_CHARS = 64 * 1024
+
+# stderr kept for step details; the sandbox drops the rest as it streams in
+_STDERR_DETAIL_CHARS = 1000
+
+# Printed instead of test results when a diff fails to apply, so patch
+# and test run share one sandbox exec
+_PATCH_FAILED_MARKER = "ssr-patch-failed"
+
+# Match --- a/... or +++ b/... header lines anywhere in a diff. Anchoring on
+# a literal newline (rather than ^ with MULTILINE) lets the regex engine
+# jump between candidate lines, so callers prepend one for the first line
+_DIFF_FILE_RE = re.compile(r'\n(?:---|\+\+\+) [ab]/(.+)')
+
+
+def _harness_files(artifact: BugArtifact) -> dict[str, str]:
+    """Test harness and diffs used by the validation steps, keyed by sandbox path."""
+    return {
+        "test_script.sh": artifact.test_script,
+        "test_parser.py": artifact.test_parser,
+        "bug_inject.diff": artifact.bug_inject_diff,
+        "test_weaken.diff": artifact.test_weaken_diff,
+    }
+
+
+# Raw parser status string -> TestStatus, for O(1) lookups per test
+_STATUS_BY_VALUE = {status.value: status for status in TestStatus}
+
+
+def _coerce_statuses(
+    mapping: dict[str, Any], default: TestStatus
+) -> dict[str, TestStatus]:
+    """Convert raw parser output to TestStatus values, using ``default`` for unknown ones."""
+    return {
+        test_id: _STATUS_BY_VALUE.get(status, default) if isinstance(status, str) else default
+        for test_id, status in mapping.items()
+    }
+
 
 @dataclass
 class ValidationContext:
     """Context for validation operations."""
     artifact: BugArtifact
     sandbox: Sandbox
+    test_files_set: frozenset[str] = frozenset()
     test_mapping: dict[str, TestStatus] | None = None
     bug_test_mapping: dict[str, TestStatus] | None = None
     weak_test_mapping: dict[str, TestStatus] | None = None
@@ -47,6 +103,25 @@ class ValidationContext:
     changed_test_files: list[str] | None = None
 
 
+class _StepBuilder:
+    """Outcome of one validation step; ``Validator._step`` fills in the duration."""
+    
+    def __init__(self, name: ValidationStepName):
+        # Every field is set by the validator itself, so skip model validation
+        self.result = ValidationStepResult.model_construct(name=name, passed=False)
+    
+    def succeed(self, **details: Any) -> ValidationStepResult:
+        self.result.passed = True
+        self.result.details = details
+        return self.result
+    
+    def fail(self, error_message: str, **details: Any) -> ValidationStepResult:
+        self.result.passed = False
+        self.result.details = details
+        self.result.error_message = error_message
+        return self.result
+
+
 class Validator:
     """
     Validates bug artifacts according to SSR paper requirements.
@@ -74,9 +149,13 @@ class Validator:
         Returns a ValidationReport with pass/fail status for each step.
         """
         self._logs = []
-        start_time = time.time()
+        start_time = time.perf_counter_ns()
         
-        ctx = ValidationContext(artifact=artifact, sandbox=self.sandbox)
+        ctx = ValidationContext(
+            artifact=artifact,
+            sandbox=self.sandbox,
+            test_files_set=frozenset(artifact.test_files),
+        )
         steps: list[ValidationStepResult] = []
         
         # Step 1: Test files existence
@@ -122,6 +201,18 @@ class Validator:
         
         return self._build_report(artifact.metadata.artifact_id, steps, start_time)
     
+    @asynccontextmanager
+    async def _step(self, name: ValidationStepName) -> AsyncIterator[_StepBuilder]:
+        """Time a validation step; an exception raised in its body fails the step."""
+        start = time.perf_counter_ns()
+        step = _StepBuilder(name)
+        try:
+            yield step
+        except Exception as e:
+            step.fail(str(e))
+        finally:
+            step.result.duration_ms = (time.perf_counter_ns() - start) // 1_000_000
+    
     async def _validate_test_files_existence(
         self, ctx: ValidationContext
     ) -> ValidationStepResult:
@@ -131,25 +222,26 @@ class Validator:
         - All files in test_files.txt must exist in the original repo
         - test_weaken.diff should only touch files in test_files.txt
         """
-        step_start = time.time()
         self._log("Validating test files existence")
         
-        try:
+        async with self._step(ValidationStepName.TEST_FILES_EXISTENCE) as step:
             test_files = ctx.artifact.test_files
             missing_files = []
             
-            for test_file in test_files:
-                result = await self.sandbox.bash(f"test -f {test_file}")
+            for i in range(0, len(test_files), _FILE_CHECK_BATCH):
+                paths = " ".join(shlex.quote(f) for f in test_files[i:i + _FILE_CHECK_BATCH])
+                result = await self.sandbox.bash(
+                    f"for f in {paths}; do [ -f \"$f\" ] || printf '%s\\n' \"$f\"; done",
+                    stderr_limit=_STDERR_DETAIL_CHARS,
+                )
                 if result.exit_code != 0:
-                    missing_files.append(test_file)
+                    raise RuntimeError(f"Test file check failed: {result.stderr}")
+                missing_files.extend(result.stdout.splitlines())
             
             if missing_files:
-                return ValidationStepResult(
-                    name=ValidationStepName.TEST_FILES_EXISTENCE,
-                    passed=False,
-                    details={"missing_files": missing_files},
-                    error_message=f"Missing test files: {missing_files}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail(
+                    f"Missing test files: {missing_files}",
+                    missing_files=missing_files,
                 )
             
             # Parse test_weaken.diff to get changed files
@@ -157,34 +249,18 @@ class Validator:
             ctx.changed_test_files = weak_diff_files
             
             # Check that weakening diff only touches test files
-            non_test_files = [f for f in weak_diff_files if f not in test_files]
+            non_test_files = list(set(weak_diff_files).difference(ctx.test_files_set))
             if non_test_files:
-                return ValidationStepResult(
-                    name=ValidationStepName.TEST_FILES_EXISTENCE,
-                    passed=False,
-                    details={
-                        "test_files": test_files,
-                        "weak_diff_files": weak_diff_files,
-                        "non_test_files": non_test_files,
-                    },
-                    error_message=f"test_weaken.diff modifies non-test files: {non_test_files}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail(
+                    f"test_weaken.diff modifies non-test files: {non_test_files}",
+                    test_files=test_files,
+                    weak_diff_files=weak_diff_files,
+                    non_test_files=non_test_files,
                 )
             
-            return ValidationStepResult(
-                name=ValidationStepName.TEST_FILES_EXISTENCE,
-                passed=True,
-                details={"test_files_count": len(test_files)},
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+            return step.succeed(test_files_count=len(test_files))
         
-        except Exception as e:
-            return ValidationStepResult(
-                name=ValidationStepName.TEST_FILES_EXISTENCE,
-                passed=False,
-                error_message=str(e),
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+        return step.result
     
     async def _validate_parser(self, ctx: ValidationContext) -> ValidationStepResult:
         """
@@ -193,72 +269,49 @@ class Validator:
         Run: bash test_script.sh | python test_parser.py
         Output should be valid JSON: {test_id: "passed"|"failed"|...}
         """
-        step_start = time.time()
         self._log("Validating test parser")
         
-        try:
-            # Write test script and parser to sandbox
-            await self.sandbox.write_file("test_script.sh", ctx.artifact.test_script)
-            await self.sandbox.write_file("test_parser.py", ctx.artifact.test_parser)
-            await self.sandbox.bash("chmod +x test_script.sh")
+        async with self._step(ValidationStepName.PARSER_VALIDITY) as step:
+            # Write the test harness and both diffs for the later steps in one
+            # upload; the script is run via `bash test_script.sh`, so it needs
+            # no execute bit
+            await self.sandbox.write_files(_harness_files(ctx.artifact))
             
             # Run test script and pipe to parser
             result = await self.sandbox.bash(
                 "bash test_script.sh 2>&1 | python test_parser.py",
                 timeout=ctx.artifact.metadata.max_test_runtime_sec,
+                stderr_limit=_STDERR_DETAIL_CHARS,
             )
             
             if result.timeout:
-                return ValidationStepResult(
-                    name=ValidationStepName.PARSER_VALIDITY,
-                    passed=False,
-                    error_message=f"Test script timed out after {ctx.artifact.metadata.max_test_runtime_sec}s",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail(
+                    f"Test script timed out after {ctx.artifact.metadata.max_test_runtime_sec}s"
                 )
             
             if result.exit_code != 0:
-                return ValidationStepResult(
-                    name=ValidationStepName.PARSER_VALIDITY,
-                    passed=False,
-                    details={"stderr": result.stderr[:1000]},
-                    error_message=f"Parser failed with exit code {result.exit_code}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail(
+                    f"Parser failed with exit code {result.exit_code}",
+                    stderr=result.stderr,
                 )
             
             # Parse JSON output
             try:
-                test_mapping = json.loads(result.stdout.strip())
+                test_mapping = orjson.loads(result.stdout)
                 if not isinstance(test_mapping, dict):
                     raise ValueError("Parser output must be a JSON object")
                 
-                ctx.test_mapping = {
-                    k: TestStatus(v) if v in TestStatus.__members__.values() else TestStatus.PASSED
-                    for k, v in test_mapping.items()
-                }
+                ctx.test_mapping = _coerce_statuses(test_mapping, TestStatus.PASSED)
                 
-            except json.JSONDecodeError as e:
-                return ValidationStepResult(
-                    name=ValidationStepName.PARSER_VALIDITY,
-                    passed=False,
-                    details={"output_preview": result.stdout[:500]},
-                    error_message=f"Invalid JSON from parser: {e}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+            except orjson.JSONDecodeError as e:
+                return step.fail(
+                    f"Invalid JSON from parser: {e}",
+                    output_preview=result.stdout[:500],
                 )
             
-            return ValidationStepResult(
-                name=ValidationStepName.PARSER_VALIDITY,
-                passed=True,
-                details={"test_count": len(ctx.test_mapping)},
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+            return step.succeed(test_count=len(ctx.test_mapping))
         
-        except Exception as e:
-            return ValidationStepResult(
-                name=ValidationStepName.PARSER_VALIDITY,
-                passed=False,
-                error_message=str(e),
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+        return step.result
     
     async def _validate_original_tests(
         self, ctx: ValidationContext
@@ -269,34 +322,22 @@ class Validator:
         - All tests should pass
         - Number of passing tests >= min_passing_tests
         """
-        step_start = time.time()
         self._log("Validating original tests pass")
         
-        try:
+        async with self._step(ValidationStepName.ORIGINAL_TESTS_PASS) as step:
             if not ctx.test_mapping:
-                return ValidationStepResult(
-                    name=ValidationStepName.ORIGINAL_TESTS_PASS,
-                    passed=False,
-                    error_message="No test mapping available",
-                    duration_ms=int((time.time() - step_start) * 1000),
-                )
-            
-            # Check all tests pass
-            failed_tests = [
-                test_id for test_id, status in ctx.test_mapping.items()
-                if status != TestStatus.PASSED
-            ]
-            
-            if failed_tests:
-                return ValidationStepResult(
-                    name=ValidationStepName.ORIGINAL_TESTS_PASS,
-                    passed=False,
-                    details={
-                        "failed_tests": failed_tests[:10],
-                        "failed_count": len(failed_tests),
-                    },
-                    error_message=f"{len(failed_tests)} tests failed on original codebase",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail("No test mapping available")
+            
+            # Check all tests pass; the failure list is only built when one fails
+            if any(status != TestStatus.PASSED for status in ctx.test_mapping.values()):
+                failed_tests = [
+                    test_id for test_id, status in ctx.test_mapping.items()
+                    if status != TestStatus.PASSED
+                ]
+                return step.fail(
+                    f"{len(failed_tests)} tests failed on original codebase",
+                    failed_tests=failed_tests[:10],
+                    failed_count=len(failed_tests),
                 )
             
             # Check minimum passing tests
@@ -304,28 +345,15 @@ class Validator:
             min_required = ctx.artifact.metadata.min_passing_tests
             
             if passing_count < min_required:
-                return ValidationStepResult(
-                    name=ValidationStepName.ORIGINAL_TESTS_PASS,
-                    passed=False,
-                    details={"passing_count": passing_count, "min_required": min_required},
-                    error_message=f"Only {passing_count} tests, need at least {min_required}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail(
+                    f"Only {passing_count} tests, need at least {min_required}",
+                    passing_count=passing_count,
+                    min_required=min_required,
                 )
             
-            return ValidationStepResult(
-                name=ValidationStepName.ORIGINAL_TESTS_PASS,
-                passed=True,
-                details={"num_tests": passing_count},
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+            return step.succeed(num_tests=passing_count)
         
-        except Exception as e:
-            return ValidationStepResult(
-                name=ValidationStepName.ORIGINAL_TESTS_PASS,
-                passed=False,
-                error_message=str(e),
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+        return step.result
     
     async def _validate_bug_scope(self, ctx: ValidationContext) -> ValidationStepResult:
         """
@@ -334,57 +362,35 @@ class Validator:
         - bug_inject.diff modifies >= min_changed_files code files
         - bug_inject.diff should NOT modify test files
         """
-        step_start = time.time()
         self._log("Validating bug scope")
         
-        try:
+        async with self._step(ValidationStepName.BUG_SCOPE) as step:
             # Parse bug_inject.diff to get changed files
             changed_files = self._parse_diff_files(ctx.artifact.bug_inject_diff)
             ctx.changed_code_files = changed_files
             
             # Check that bug diff doesn't touch test files
-            test_files_modified = [
-                f for f in changed_files if f in ctx.artifact.test_files
-            ]
+            test_files_modified = list(ctx.test_files_set.intersection(changed_files))
             
             if test_files_modified:
-                return ValidationStepResult(
-                    name=ValidationStepName.BUG_SCOPE,
-                    passed=False,
-                    details={"test_files_modified": test_files_modified},
-                    error_message=f"bug_inject.diff modifies test files: {test_files_modified}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail(
+                    f"bug_inject.diff modifies test files: {test_files_modified}",
+                    test_files_modified=test_files_modified,
                 )
             
             # Check minimum changed files
             min_required = ctx.artifact.metadata.min_changed_files
             
             if len(changed_files) < min_required:
-                return ValidationStepResult(
-                    name=ValidationStepName.BUG_SCOPE,
-                    passed=False,
-                    details={
-                        "changed_files": len(changed_files),
-                        "min_required": min_required,
-                    },
-                    error_message=f"Only {len(changed_files)} files changed, need at least {min_required}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail(
+                    f"Only {len(changed_files)} files changed, need at least {min_required}",
+                    changed_files=len(changed_files),
+                    min_required=min_required,
                 )
             
-            return ValidationStepResult(
-                name=ValidationStepName.BUG_SCOPE,
-                passed=True,
-                details={"changed_files": len(changed_files), "files": changed_files},
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+            return step.succeed(changed_files=len(changed_files), files=changed_files)
         
-        except Exception as e:
-            return ValidationStepResult(
-                name=ValidationStepName.BUG_SCOPE,
-                passed=False,
-                error_message=str(e),
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+        return step.result
     
     async def _validate_bug_validity(
         self, ctx: ValidationContext
@@ -395,86 +401,44 @@ class Validator:
         After applying bug_inject.diff:
         - At least min_failing_tests tests should fail
         """
-        step_start = time.time()
         self._log("Validating bug validity")
         
-        try:
-            # Apply bug injection patch
-            await self.sandbox.write_file("bug_inject.diff", ctx.artifact.bug_inject_diff)
-            result = await self.sandbox.bash("patch -p1 < bug_inject.diff")
+        async with self._step(ValidationStepName.BUG_VALIDITY) as step:
+            # Apply bug injection patch and run the tests again
+            test_result = await self._run_tests_after_patch(ctx, "bug_inject.diff")
             
-            if result.exit_code != 0:
-                return ValidationStepResult(
-                    name=ValidationStepName.BUG_VALIDITY,
-                    passed=False,
-                    details={"stderr": result.stderr[:1000]},
-                    error_message="Failed to apply bug_inject.diff",
-                    duration_ms=int((time.time() - step_start) * 1000),
+            if test_result.stdout == _PATCH_FAILED_MARKER:
+                return step.fail(
+                    "Failed to apply bug_inject.diff",
+                    stderr=test_result.stderr,
                 )
             
-            # Run tests again
-            test_result = await self.sandbox.bash(
-                "bash test_script.sh 2>&1 | python test_parser.py",
-                timeout=ctx.artifact.metadata.max_test_runtime_sec,
-            )
-            
             if test_result.timeout:
-                return ValidationStepResult(
-                    name=ValidationStepName.BUG_VALIDITY,
-                    passed=False,
-                    error_message="Test script timed out after bug injection",
-                    duration_ms=int((time.time() - step_start) * 1000),
-                )
+                return step.fail("Test script timed out after bug injection")
             
             # Parse test results
             try:
-                bug_mapping = json.loads(test_result.stdout.strip())
-                ctx.bug_test_mapping = {
-                    k: TestStatus(v) if v in TestStatus.__members__.values() else TestStatus.FAILED
-                    for k, v in bug_mapping.items()
-                }
-            except json.JSONDecodeError:
-                return ValidationStepResult(
-                    name=ValidationStepName.BUG_VALIDITY,
-                    passed=False,
-                    error_message="Failed to parse test results after bug injection",
-                    duration_ms=int((time.time() - step_start) * 1000),
-                )
+                bug_mapping = orjson.loads(test_result.stdout)
+                ctx.bug_test_mapping = _coerce_statuses(bug_mapping, TestStatus.FAILED)
+            except orjson.JSONDecodeError:
+                return step.fail("Failed to parse test results after bug injection")
             
-            # Count failing tests
-            failing_tests = [
-                test_id for test_id, status in ctx.bug_test_mapping.items()
-                if status == TestStatus.FAILED
-            ]
+            # Count failing tests; countOf runs in C and matches the coerced
+            # statuses by identity
+            failing_count = operator.countOf(ctx.bug_test_mapping.values(), TestStatus.FAILED)
             
             min_required = ctx.artifact.metadata.min_failing_tests
             
-            if len(failing_tests) < min_required:
-                return ValidationStepResult(
-                    name=ValidationStepName.BUG_VALIDITY,
-                    passed=False,
-                    details={
-                        "failing_tests": len(failing_tests),
-                        "min_required": min_required,
-                    },
-                    error_message=f"Only {len(failing_tests)} tests fail, need at least {min_required}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+            if failing_count < min_required:
+                return step.fail(
+                    f"Only {failing_count} tests fail, need at least {min_required}",
+                    failing_tests=failing_count,
+                    min_required=min_required,
                 )
             
-            return ValidationStepResult(
-                name=ValidationStepName.BUG_VALIDITY,
-                passed=True,
-                details={"failing_tests": len(failing_tests)},
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+            return step.succeed(failing_tests=failing_count)
         
-        except Exception as e:
-            return ValidationStepResult(
-                name=ValidationStepName.BUG_VALIDITY,
-                passed=False,
-                error_message=str(e),
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+        return step.result
     
     async def _validate_test_weakening(
         self, ctx: ValidationContext
@@ -485,74 +449,43 @@ class Validator:
         After applying test_weaken.diff:
         - Some tests that failed in buggy state should now pass
         """
-        step_start = time.time()
         self._log("Validating test weakening")
         
-        try:
-            # Apply test weakening patch
-            await self.sandbox.write_file("test_weaken.diff", ctx.artifact.test_weaken_diff)
-            result = await self.sandbox.bash("patch -p1 < test_weaken.diff")
+        async with self._step(ValidationStepName.TEST_WEAKENING_VALIDITY) as step:
+            # Apply test weakening patch and run the tests again
+            test_result = await self._run_tests_after_patch(ctx, "test_weaken.diff")
             
-            if result.exit_code != 0:
-                return ValidationStepResult(
-                    name=ValidationStepName.TEST_WEAKENING_VALIDITY,
-                    passed=False,
-                    details={"stderr": result.stderr[:1000]},
-                    error_message="Failed to apply test_weaken.diff",
-                    duration_ms=int((time.time() - step_start) * 1000),
+            if test_result.stdout == _PATCH_FAILED_MARKER:
+                return step.fail(
+                    "Failed to apply test_weaken.diff",
+                    stderr=test_result.stderr,
                 )
             
-            # Run tests again
-            test_result = await self.sandbox.bash(
-                "bash test_script.sh 2>&1 | python test_parser.py",
-                timeout=ctx.artifact.metadata.max_test_runtime_sec,
-            )
-            
             # Parse test results
             try:
-                weak_mapping = json.loads(test_result.stdout.strip())
-                ctx.weak_test_mapping = {
-                    k: TestStatus(v) if v in TestStatus.__members__.values() else TestStatus.FAILED
-                    for k, v in weak_mapping.items()
-                }
-            except json.JSONDecodeError:
-                return ValidationStepResult(
-                    name=ValidationStepName.TEST_WEAKENING_VALIDITY,
-                    passed=False,
-                    error_message="Failed to parse test results after weakening",
-                    duration_ms=int((time.time() - step_start) * 1000),
-                )
+                weak_mapping = orjson.loads(test_result.stdout)
+                ctx.weak_test_mapping = _coerce_statuses(weak_mapping, TestStatus.FAILED)
+            except orjson.JSONDecodeError:
+                return step.fail("Failed to parse test results after weakening")
             
             # Check that some previously failing tests now pass
-            recovered_tests = []
+            recovered_tests: set[str] = set()
             if ctx.bug_test_mapping:
-                for test_id, status in ctx.weak_test_mapping.items():
-                    bug_status = ctx.bug_test_mapping.get(test_id)
-                    if bug_status == TestStatus.FAILED and status == TestStatus.PASSED:
-                        recovered_tests.append(test_id)
+                bug_failed = {
+                    test_id for test_id, status in ctx.bug_test_mapping.items()
+                    if status == TestStatus.FAILED
+                }
+                recovered_tests = bug_failed & {
+                    test_id for test_id, status in ctx.weak_test_mapping.items()
+                    if status == TestStatus.PASSED
+                }
             
             if not recovered_tests:
-                return ValidationStepResult(
-                    name=ValidationStepName.TEST_WEAKENING_VALIDITY,
-                    passed=False,
-                    error_message="No tests recovered after applying test_weaken.diff",
-                    duration_ms=int((time.time() - step_start) * 1000),
-                )
+                return step.fail("No tests recovered after applying test_weaken.diff")
             
-            return ValidationStepResult(
-                name=ValidationStepName.TEST_WEAKENING_VALIDITY,
-                passed=True,
-                details={"recovered_tests": len(recovered_tests)},
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+            return step.succeed(recovered_tests=len(recovered_tests))
         
-        except Exception as e:
-            return ValidationStepResult(
-                name=ValidationStepName.TEST_WEAKENING_VALIDITY,
-                passed=False,
-                error_message=str(e),
-                duration_ms=int((time.time() - step_start) * 1000),
-            )
+        return step.result
     
     async def _validate_inverse_mutation(
         self, ctx: ValidationContext
@@ -566,25 +499,14 @@ class Validator:
         
         This ensures each modified file contributes to the bug.
         """
-        step_start = time.time()
         self._log("Validating inverse mutation testing")
         
-        try:
+        async with self._step(ValidationStepName.INVERSE_MUTATION_TESTING) as step:
             if not ctx.changed_code_files:
-                return ValidationStepResult(
-                    name=ValidationStepName.INVERSE_MUTATION_TESTING,
-                    passed=False,
-                    error_message="No changed code files to test",
-                    duration_ms=int((time.time() - step_start) * 1000),
-                )
+                return step.fail("No changed code files to test")
             
             if not ctx.bug_test_mapping:
-                return ValidationStepResult(
-                    name=ValidationStepName.INVERSE_MUTATION_TESTING,
-                    passed=False,
-                    error_message="No bug test mapping available",
-                    duration_ms=int((time.time() - step_start) * 1000),
-                )
+                return step.fail("No bug test mapping available")
             
             # Get failing tests from oracle (bug state, not weakened)
             failing_tests = [
@@ -592,69 +514,187 @@ class Validator:
                 if status == TestStatus.FAILED
             ]
             
-            # First, reset to original state and re-apply bug
+            # First, reset to original state
             await self.sandbox.bash("patch -R -p1 < test_weaken.diff")
             await self.sandbox.bash("patch -R -p1 < bug_inject.diff")
+            await self._prepare_inverse_workspace(self.sandbox, ctx)
             
-            # For each modified file, test if reverting it helps
-            non_contributing_files = []
+            # Files are independent, so they are spread over this sandbox
+            # and extra leased copies of the same image
+            files = ctx.changed_code_files
+            contributes: dict[str, bool | None] = {}
             
-            for file_path in ctx.changed_code_files:
-                # Re-apply full bug
-                await self.sandbox.bash("patch -p1 < bug_inject.diff")
+            test_filter = "\n".join(failing_tests)
+            env = (
+                {_TEST_FILTER_ENV: test_filter}
+                if len(test_filter) <= _TEST_FILTER_MAX_CHARS else None
+            )
+            
+            # The filter is only trusted if a filtered run of the unmodified
+            # bug (the current workspace) reproduces the oracle failures
+            if env is not None and not await self._filter_reproduces_oracle(
+                ctx, failing_tests, env
+            ):
+                self._log("Filtered test run does not match the oracle, running full suite")
+                env = None
+            
+            async with AsyncExitStack() as stack:
+                extra = min(validator_config.inverse_mutation_workers, len(files)) - 1
+                workers = [self.sandbox]
+                if extra > 0:
+                    workers += await self._lease_inverse_workers(stack, ctx, extra)
                 
-                # Revert just this file to original
-                await self.sandbox.bash(f"git checkout HEAD -- {file_path}")
+                pending = iter(files)
                 
-                # Run oracle tests (without weakening)
-                test_result = await self.sandbox.bash(
-                    "bash test_script.sh 2>&1 | python test_parser.py",
-                    timeout=ctx.artifact.metadata.max_test_runtime_sec,
-                )
+                async def drain(sandbox: Sandbox) -> None:
+                    for file_path in pending:
+                        contributes[file_path] = await self._file_contributes(
+                            sandbox, ctx, file_path, failing_tests, env
+                        )
                 
+                # A TaskGroup cancels and awaits the other drains if one fails,
+                # so no check is left running in a sandbox being released
                 try:
-                    partial_mapping = json.loads(test_result.stdout.strip())
-                except json.JSONDecodeError:
-                    continue
-                
-                # Check if any previously failing test now passes
-                recovered = False
-                for test_id in failing_tests:
-                    old_status = ctx.bug_test_mapping.get(test_id)
-                    new_status = partial_mapping.get(test_id)
-                    if old_status == TestStatus.FAILED and new_status == "passed":
-                        recovered = True
-                        break
-                
-                if not recovered:
-                    non_contributing_files.append(file_path)
-                
-                # Reset for next iteration
-                await self.sandbox.bash("patch -R -p1 < bug_inject.diff")
+                    async with asyncio.TaskGroup() as tg:
+                        for sandbox in workers:
+                            tg.create_task(drain(sandbox))
+                except ExceptionGroup as eg:
+                    raise eg.exceptions[0]
+            
+            # Files whose test output could not be parsed are not counted
+            non_contributing_files = [f for f in files if contributes[f] is False]
             
             if non_contributing_files:
-                return ValidationStepResult(
-                    name=ValidationStepName.INVERSE_MUTATION_TESTING,
-                    passed=False,
-                    details={"non_contributing_files": non_contributing_files},
-                    error_message=f"Files don't contribute to bug: {non_contributing_files}",
-                    duration_ms=int((time.time() - step_start) * 1000),
+                return step.fail(
+                    f"Files don't contribute to bug: {non_contributing_files}",
+                    non_contributing_files=non_contributing_files,
                 )
             
-            return ValidationStepResult(
-                name=ValidationStepName.INVERSE_MUTATION_TESTING,
-                passed=True,
-                details={"tested_files": len(ctx.changed_code_files)},
-                duration_ms=int((time.time() - step_start) * 1000),
+            return step.succeed(tested_files=len(ctx.changed_code_files))
+        
+        return step.result
+    
+    async def _run_tests_after_patch(
+        self, ctx: ValidationContext, diff_file: str
+    ) -> BashResult:
+        """
+        Apply ``diff_file`` and run the tests in a single sandbox exec.
+        
+        If the patch does not apply, stdout is ``_PATCH_FAILED_MARKER`` and
+        stderr holds patch's error output.
+        """
+        return await self.sandbox.bash(
+            f"patch -p1 < {diff_file} > /dev/null || "
+            f"{{ printf %s {_PATCH_FAILED_MARKER}; exit 1; }}\n"
+            "bash test_script.sh 2>&1 | python test_parser.py",
+            timeout=ctx.artifact.metadata.max_test_runtime_sec,
+            stderr_limit=_STDERR_DETAIL_CHARS,
+        )
+    
+    async def _prepare_inverse_workspace(
+        self, sandbox: Sandbox, ctx: ValidationContext
+    ) -> None:
+        """
+        Commit the original and buggy states (with the test harness) so each
+        file check starts from a git checkout instead of re-running patch.
+        """
+        await sandbox.write_files(_harness_files(ctx.artifact))
+        await sandbox.git_tag(_INVERSE_BASE_TAG)
+        await sandbox.bash("patch -p1 < bug_inject.diff")
+        await sandbox.git_tag(_INVERSE_BUG_TAG)
+    
+    async def _lease_inverse_workers(
+        self, stack: AsyncExitStack, ctx: ValidationContext, count: int
+    ) -> list[Sandbox]:
+        """
+        Lease up to ``count`` extra sandboxes for inverse mutation.
+        
+        Best effort: workers that cannot be leased (e.g. the pool is full)
+        or prepared are skipped, and their files go to the others.
+        """
+        async def lease() -> Sandbox:
+            sandbox = await stack.enter_async_context(
+                sandbox_pool.lease(self.sandbox.image_ref, wait=False)
             )
+            await sandbox.git_init()
+            await self._prepare_inverse_workspace(sandbox, ctx)
+            return sandbox
         
-        except Exception as e:
-            return ValidationStepResult(
-                name=ValidationStepName.INVERSE_MUTATION_TESTING,
-                passed=False,
-                error_message=str(e),
-                duration_ms=int((time.time() - step_start) * 1000),
+        results = await asyncio.gather(
+            *(lease() for _ in range(count)), return_exceptions=True
+        )
+        workers = [r for r in results if isinstance(r, Sandbox)]
+        if len(workers) < count:
+            self._log(
+                "Running inverse mutation with fewer workers", leased=len(workers), wanted=count
             )
+        return workers
+    
+    async def _file_contributes(
+        self,
+        sandbox: Sandbox,
+        ctx: ValidationContext,
+        file_path: str,
+        failing_tests: list[str],
+        env: dict[str, str] | None,
+    ) -> bool | None:
+        """
+        Apply the bug with one file reverted and check whether any oracle
+        failing test passes again. Returns None if the output is unparseable.
+        
+        Scripts that honor ``SSR_TEST_FILTER`` only run the failing tests;
+        if a filtered run does not report all of them, the full suite is
+        run instead.
+        """
+        # Start from the full bug with just this file reverted to original;
+        # only the files that differ from the last check are rewritten
+        await sandbox.bash(
+            f"git reset -q --hard {_INVERSE_BUG_TAG} && git clean -fdq && "
+            f"git checkout {_INVERSE_BASE_TAG} -- {shlex.quote(file_path)}"
+        )
+        
+        # Run oracle tests (without weakening)
+        mapping = await self._run_oracle_tests(sandbox, ctx, env)
+        if env is not None and (
+            mapping is None or not all(test_id in mapping for test_id in failing_tests)
+        ):
+            mapping = await self._run_oracle_tests(sandbox, ctx, None)
+        if mapping is None:
+            return None
+        
+        return any(mapping.get(test_id) == "passed" for test_id in failing_tests)
+    
+    async def _filter_reproduces_oracle(
+        self,
+        ctx: ValidationContext,
+        failing_tests: list[str],
+        env: dict[str, str],
+    ) -> bool:
+        """Check that a filtered run in the buggy workspace fails every oracle failing test."""
+        mapping = await self._run_oracle_tests(self.sandbox, ctx, env)
+        if mapping is None:
+            return False
+        statuses = _coerce_statuses(mapping, TestStatus.FAILED)
+        return all(statuses.get(test_id) == TestStatus.FAILED for test_id in failing_tests)
+    
+    async def _run_oracle_tests(
+        self,
+        sandbox: Sandbox,
+        ctx: ValidationContext,
+        env: dict[str, str] | None,
+    ) -> dict[str, Any] | None:
+        """Run the test pipeline and return the raw mapping, or None if unparseable."""
+        test_result = await sandbox.bash(
+            "bash test_script.sh 2>&1 | python test_parser.py",
+            timeout=ctx.artifact.metadata.max_test_runtime_sec,
+            env=env,
+        )
+        
+        try:
+            mapping = orjson.loads(test_result.stdout)
+        except orjson.JSONDecodeError:
+            return None
+        return mapping if isinstance(mapping, dict) else None
     
     def _parse_diff_files(self, diff_content: str) -> list[str]:
         """
@@ -664,29 +704,21 @@ class Validator:
         --- a/path/to/file.py
         +++ b/path/to/file.py
         """
-        files = set()
-        
-        # Match --- a/... or +++ b/... patterns
-        pattern = r'^(?:---|\+\+\+) [ab]/(.+)$'
-        
-        for line in diff_content.split('\n'):
-            match = re.match(pattern, line)
-            if match:
-                file_path = match.group(1)
-                # Skip /dev/null (for added/deleted files)
-                if file_path != '/dev/null':
-                    files.add(file_path)
-        
-        return list(files)
+        return list({
+            match.group(1)
+            for match in _DIFF_FILE_RE.finditer("\n" + diff_content)
+            # Skip /dev/null (for added/deleted files)
+            if match.group(1) != '/dev/null'
+        })
     
     def _build_report(
         self,
         artifact_id: UUID,
         steps: list[ValidationStepResult],
-        start_time: float,
+        start_time: int,
     ) -> ValidationReport:
         """Build the final validation report."""
-        total_duration_ms = int((time.time() - start_time) * 1000)
+        total_duration_ms = (time.perf_counter_ns() - start_time) // 1_000_000
         all_passed = all(step.passed for step in steps)
         
         return ValidationReport(